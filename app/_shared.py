@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Modern Magic Formula - shared Streamlit helpers
+Page chrome, cached data loading and formatting helpers used by every page
+"""
+
+import streamlit as st
+import pandas as pd
+import numpy as np
+import sys
+import os
+import zlib
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCREENING_CSV = 'data/latest_screening_hybrid.csv'
+SCREENING_PARQUET = 'data/latest_screening_hybrid.parquet'  # Built by the ETL / scripts/build_screening_parquet.py
+
+MAX_SCATTER_POINTS = 5000  # Downsample threshold for the EY vs ROC scatter
+CHART_PIXEL_WIDTH = 2000   # ~1000px wide chart at 2x device pixel ratio
+
+# Compact dtypes for the columns the pages filter and group on
+SCREENING_DTYPES = {
+    'f_score': 'int8',              # Piotroski score is 0-9
+    'magic_formula_rank': 'int32',
+    'sector': 'category',
+    'earnings_yield': 'float32',
+    'roc': 'float32',
+    'market_cap': 'float32',
+}
+
+CUSTOM_CSS = """
+<style>
+.metric-card {
+    background-color: #f0f2f6;
+    padding: 1rem;
+    border-radius: 0.5rem;
+    border-left: 4px solid #1f77b4;
+}
+
+.diy-highlight {
+    background-color: #e8f5e8;
+    padding: 1rem;
+    border-radius: 0.5rem;
+    border: 2px solid #28a745;
+}
+
+.warning-box {
+    background-color: #fff3cd;
+    padding: 1rem;
+    border-radius: 0.5rem;
+    border-left: 4px solid #ffc107;
+}
+</style>
+"""
+
+# Helper functions
+@st.cache_data(ttl=3600)  # Cache for 1 hour
+def load_screening_data():
+    """Load latest screening data, preferring the Parquet copy when it is up to date"""
+    try:
+        if os.path.exists(SCREENING_PARQUET) and (
+            not os.path.exists(SCREENING_CSV)
+            or os.path.getmtime(SCREENING_PARQUET) >= os.path.getmtime(SCREENING_CSV)
+        ):
+            data = pd.read_parquet(SCREENING_PARQUET, engine='pyarrow').astype(SCREENING_DTYPES)
+        else:
+            data = pd.read_csv(SCREENING_CSV, dtype=SCREENING_DTYPES)
+        # Sorted sector categories double as the Professional page's sector options
+        data['sector'] = data['sector'].cat.reorder_categories(sorted(data['sector'].cat.categories))
+        return data
+    except Exception as e:
+        st.error(f"Could not load screening data: {e}")
+        return pd.DataFrame()
+
+@st.cache_data
+def get_data_quality_score(csv_mtime):
+    """Get current data quality score (1.0 when every check passes, 0.0 otherwise)
+
+    Cached on the CSV's modification time, so the checks rerun only when the
+    file changes rather than on a timer.
+    """
+    try:
+        # Only this check needs repo-level packages, so extend the path lazily
+        if REPO_ROOT not in sys.path:
+            sys.path.append(REPO_ROOT)
+        from data_quality.monitoring import run_data_quality_checks
+
+        run_data_quality_checks(SCREENING_CSV)
+        return 1.0
+    except Exception:
+        return 0.0  # Checks failed or could not run
+
+def get_screening_csv_mtime():
+    """Modification time of the screening CSV (0.0 when it is missing)"""
+    try:
+        return os.path.getmtime(SCREENING_CSV)
+    except OSError:
+        return 0.0
+
+def apply_diy_filters(data, min_fscore=5, min_market_cap=1e9):
+    """Apply DIY-appropriate filters"""
+    mask = data['f_score'].to_numpy() >= min_fscore
+    mask &= data['market_cap'].to_numpy() >= min_market_cap
+    mask &= data['earnings_yield'].to_numpy() > 0
+    mask &= data['roc'].to_numpy() > 0
+    filtered = data.iloc[mask]
+
+    # Simple sector diversification
+    max_per_sector = max(1, len(filtered) // 4)  # Max 25% per sector
+
+    # groupby().head() keeps row order, so the picks stay sorted by rank
+    return (
+        filtered.sort_values('magic_formula_rank')
+        .groupby('sector', sort=False, observed=True)
+        .head(max_per_sector)
+    )
+
+@st.cache_data(ttl=3600)
+def get_diy_picks(min_fscore, min_market_cap, portfolio_size):
+    """Cached DIY picks, keyed on the sidebar settings only"""
+    data = load_screening_data()
+    return apply_diy_filters(data, min_fscore, min_market_cap).head(portfolio_size)
+
+def count_sectors(sectors):
+    """Stocks per sector from a categorical column, largest first (empty sectors dropped)"""
+    codes = sectors.cat.codes.to_numpy()
+    counts = np.bincount(codes[codes >= 0], minlength=len(sectors.cat.categories))
+    counts = pd.Series(counts, index=sectors.cat.categories.tolist())
+    return counts[counts > 0].sort_values(ascending=False, kind='stable')
+
+def get_current_prices_mock(tickers):
+    """Mock current prices for a batch of tickers - in production would use yfinance"""
+    # Stable per-ticker seed, mixed with the SplitMix64 finalizer so every
+    # ticker gets its own reproducible draw without reseeding an RNG per ticker
+    z = np.array([zlib.crc32(t.encode()) for t in tickers], dtype=np.uint64)
+    z += np.uint64(0x9E3779B97F4A7C15)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    z ^= z >> np.uint64(31)
+    uniform = (z >> np.uint64(11)) * 2.0**-53  # Top 53 bits -> [0, 1)
+    return 50 + uniform * 250
+
+def format_percent(series):
+    """Format a series of fractions as percentage strings (e.g. 0.123 -> 12.3%)"""
+    return series.mul(100).round(1).astype(str) + '%'
+
+def format_billions(series):
+    """Format a series of dollar amounts in billions (e.g. 1.5e9 -> $1.5B)"""
+    return '$' + series.div(1e9).round(1).astype(str) + 'B'
+
+def m4_downsample(df, columns, n_buckets=CHART_PIXEL_WIDTH):
+    """M4 aggregation: keep only the first/last/min/max rows of each pixel bucket"""
+    n = len(df)
+    if n <= 4 * n_buckets:
+        return df
+    
+    bucket = np.arange(n) * n_buckets // n
+    starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+    ends = np.r_[starts[1:], n] - 1
+    keep = [starts, ends]
+    for col in columns:
+        groups = pd.Series(df[col].to_numpy()).groupby(bucket)
+        keep += [groups.idxmin().to_numpy(), groups.idxmax().to_numpy()]
+    
+    return df.iloc[np.unique(np.concatenate(keep))]
+
+def cumulative_growth_and_volatility(returns, periods_per_year=252):
+    """Growth of $1 and annualized volatility for a (days x strategies) return array"""
+    growth = np.cumprod(1 + returns, axis=0)
+    volatility = returns.std(axis=0) * np.sqrt(periods_per_year)
+    return growth, volatility
+
+def get_session_figure(key, inputs, build):
+    """Plotly figure kept in session state, rebuilt only when its inputs change"""
+    cached = st.session_state.get(key)
+    if cached is not None and cached[0] == inputs:
+        return cached[1]
+    
+    fig = build()
+    st.session_state[key] = (inputs, fig)
+    return fig
+
+def calculate_position_size(portfolio_value, num_stocks):
+    """Calculate equal-weight position size"""
+    return portfolio_value / num_stocks
+
+def setup_page():
+    """Page config, custom CSS and sidebar header shared by every page"""
+    st.set_page_config(
+        page_title="🎯 Modern Magic Formula",
+        page_icon="🎯",
+        layout="wide",
+        initial_sidebar_state="expanded"
+    )
+    
+    # Custom CSS for better styling
+    st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
+    
+    st.sidebar.title("🎯 Modern Magic Formula")
+    st.sidebar.markdown("*Institutional-grade value investing*")
+
+def render_footer():
+    """Disclaimer footer shown at the bottom of every page"""
+    st.markdown("---")
+    st.markdown("""
+    <div style='text-align: center; color: #666; padding: 20px;'>
+    <p>⚠️ <strong>Important Disclaimer</strong>: This tool is for educational purposes only and does not constitute investment advice. 
+    Past performance does not guarantee future results. Always consult with qualified financial advisors before making investment decisions.</p>
+    <p><small>Modern Magic Formula v2.0 | Built with institutional-grade data and risk management</small></p>
+    </div>
+    """, unsafe_allow_html=True)
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Modern Magic Formula - DIY Stock Picks
+Simple equal-weight picks and execution guidance for individual investors
+"""
+
+import streamlit as st
+import pandas as pd
+import numpy as np
+
+from _shared import (
+    calculate_position_size,
+    count_sectors,
+    format_percent,
+    get_current_prices_mock,
+    get_diy_picks,
+    load_screening_data,
+    render_footer,
+    setup_page,
+)
+
+setup_page()
+
+# DIY Interface
+st.title("🎯 DIY Magic Formula Stock Picks")
+st.markdown("*Simple value investing for individual investors*")
+
+# Settings sidebar
+with st.sidebar:
+    st.header("⚙️ Portfolio Settings")
+    portfolio_value = st.number_input(
+        "Portfolio Value ($)", 
+        min_value=5000, 
+        max_value=500000, 
+        value=25000, 
+        step=5000,
+        help="Total amount you want to invest"
+    )
+    
+    portfolio_size = st.slider(
+        "Number of Stocks", 
+        min_value=15, 
+        max_value=30, 
+        value=20,
+        help="20-30 stocks recommended for proper diversification (Magic Formula guidance)"
+    )
+    
+    min_fscore = st.selectbox(
+        "Minimum Quality Score",
+        [5, 6, 7],
+        index=0,
+        help="Higher scores = higher quality companies"
+    )
+
+# Load and filter data
+data = load_screening_data()
+
+if data.empty:
+    st.error("❌ Could not load screening data. Please try again later.")
+    st.stop()
+
+# Generate picks
+if st.button("🚀 Get My Stock Picks", type="primary", use_container_width=True):
+    with st.spinner("🔍 Analyzing 1000+ stocks..."):
+        diy_picks = get_diy_picks(min_fscore, 1e9, portfolio_size)
+    
+    if diy_picks.empty:
+        st.error("❌ No stocks meet the criteria. Try lowering the quality score.")
+        st.stop()
+    
+    st.success(f"✅ Found {len(diy_picks)} high-quality picks!")
+    
+    # Main results
+    col1, col2 = st.columns([2, 1])
+    
+    with col1:
+        st.subheader("📈 Your Stock Picks")
+        
+        # Prepare display data
+        display_data = diy_picks[[
+            'ticker', 'company_name', 'sector', 
+            'earnings_yield', 'roc', 'f_score'
+        ]].copy()
+        
+        display_data['earnings_yield'] = format_percent(display_data['earnings_yield'])
+        display_data['roc'] = format_percent(display_data['roc'])
+        
+        display_data.columns = ['Ticker', 'Company', 'Sector', 'Earnings Yield', 'ROC', 'Quality Score']
+        
+        st.dataframe(display_data, use_container_width=True, hide_index=True)
+    
+    with col2:
+        st.subheader("💰 Portfolio Summary")
+        
+        position_size = calculate_position_size(portfolio_value, len(diy_picks))
+        
+        st.metric("💵 Position Size", f"${position_size:,.0f}")
+        st.metric("📊 Total Stocks", len(diy_picks))
+        st.metric("📅 Next Rebalance", "January 2026")
+        
+        # Sector breakdown
+        sector_counts = count_sectors(diy_picks['sector'])
+        st.markdown("**Sector Breakdown:**")
+        for sector, count in sector_counts.items():
+            pct = count / len(diy_picks) * 100
+            st.write(f"• {sector}: {count} ({pct:.0f}%)")
+    
+    # Execution Guide
+    st.markdown("---")
+    st.subheader("📋 Execution Guide")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("""
+        <div class="diy-highlight">
+        <h5>✅ What To Do:</h5>
+        <ol>
+        <li><strong>Buy equal dollar amounts</strong> of each stock</li>
+        <li><strong>Use limit orders</strong> during market hours</li>
+        <li><strong>Hold for minimum 12 months</strong> (long-term capital gains)</li>
+        <li><strong>Rebalance annually in January only</strong> (Magic Formula guidance)</li>
+        <li><strong>Reinvest dividends</strong> when possible</li>
+        </ol>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown("""
+        <div class="warning-box">
+        <h5>⚠️ Important Notes:</h5>
+        <ul>
+        <li>Use <strong>fractional shares</strong> if available</li>
+        <li>Execute during <strong>normal market hours</strong></li>
+        <li>Avoid trading at <strong>market open/close</strong></li>
+        <li>Set limit orders <strong>1-2% above current price</strong></li>
+        <li>This is for <strong>education only</strong> - not advice</li>
+        </ul>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    # Detailed execution table
+    if st.checkbox("📊 Show Detailed Buy Orders"):
+        st.subheader("🎯 Detailed Execution Orders")
+        
+        current_prices = get_current_prices_mock(diy_picks['ticker'])
+        shares_needed = position_size / current_prices
+        limit_prices = current_prices * 1.02  # 2% above current
+        company_names = diy_picks['company_name'].str.slice(0, 25) + np.where(
+            diy_picks['company_name'].str.len() > 25, '...', ''
+        )
+        
+        execution_df = pd.DataFrame({
+            'Ticker': diy_picks['ticker'].to_numpy(),
+            'Company': company_names.to_numpy(),
+            'Current Price': np.char.mod('$%.2f', current_prices),
+            'Target Amount': f"${position_size:,.0f}",
+            'Shares Needed': np.char.mod('%.1f', shares_needed),
+            'Limit Price': np.char.mod('$%.2f', limit_prices)
+        })
+        st.dataframe(execution_df, use_container_width=True, hide_index=True)
+        
+        st.info("💡 **Tip**: Copy this table to track your orders. Execute over 2-3 days to avoid market impact.")
+
+render_footer()
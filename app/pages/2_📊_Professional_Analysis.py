@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Modern Magic Formula - Professional Analysis
+Advanced filters and visualizations for institutional users
+"""
+
+import streamlit as st
+
+from _shared import (
+    MAX_SCATTER_POINTS,
+    count_sectors,
+    format_billions,
+    format_percent,
+    get_screening_csv_mtime,
+    get_session_figure,
+    load_screening_data,
+    render_footer,
+    setup_page,
+)
+
+setup_page()
+
+# Professional Interface
+st.title("📊 Professional Analysis")
+st.markdown("*Advanced features for institutional users*")
+
+data = load_screening_data()
+
+if data.empty:
+    st.error("❌ Could not load screening data.")
+    st.stop()
+
+# Advanced filters - inside a form so dragging a slider doesn't rerun the
+# page; the values only change when "Apply" is pressed
+with st.sidebar.form("pro_filters"):
+    st.header("🔧 Advanced Filters")
+    
+    # Market cap filter
+    min_market_cap = st.selectbox(
+        "Minimum Market Cap",
+        [1e9, 2e9, 5e9, 10e9],
+        format_func=lambda x: f"${x/1e9:.0f}B",
+        index=0
+    )
+    
+    # Quality filters
+    min_fscore = st.slider("Min F-Score", 0, 9, 5)
+    min_ey = st.slider("Min Earnings Yield (%)", 0, 50, 0)
+    min_roc = st.slider("Min ROC (%)", -50, 100, 0)
+    
+    # Sector selection
+    sectors = ['All'] + data['sector'].cat.categories.tolist()
+    selected_sectors = st.multiselect("Sectors", sectors, default=['All'])
+    
+    st.form_submit_button("Apply Filters", type="primary", use_container_width=True)
+
+# Apply filters (one boolean buffer, combined in place)
+mask = data['market_cap'].to_numpy() >= min_market_cap
+mask &= data['f_score'].to_numpy() >= min_fscore
+mask &= data['earnings_yield'].to_numpy() >= min_ey/100
+mask &= data['roc'].to_numpy() >= min_roc/100
+filtered_data = data.iloc[mask]
+
+if 'All' not in selected_sectors and selected_sectors:
+    filtered_data = filtered_data[filtered_data['sector'].isin(selected_sectors)]
+
+# Results - one reduction for all averages (NaN -> 0 when nothing matches)
+averages = filtered_data[['earnings_yield', 'roc', 'f_score']].mean().fillna(0)
+col1, col2, col3, col4 = st.columns(4)
+
+with col1:
+    st.metric("📊 Stocks Found", len(filtered_data))
+with col2:
+    st.metric("📈 Avg Earnings Yield", f"{averages['earnings_yield']:.1%}")
+with col3:
+    st.metric("🔄 Avg ROC", f"{averages['roc']:.1%}")
+with col4:
+    st.metric("⭐ Avg Quality Score", f"{averages['f_score']:.1f}")
+
+# Display results
+if not filtered_data.empty:
+    st.subheader("📋 Filtered Results")
+    
+    # Prepare display
+    display_cols = [
+        'ticker', 'company_name', 'sector', 'market_cap', 
+        'earnings_yield', 'roc', 'f_score', 'magic_formula_rank'
+    ]
+    
+    display_data = filtered_data[display_cols].copy()
+    display_data['market_cap'] = format_billions(display_data['market_cap'])
+    display_data['earnings_yield'] = format_percent(display_data['earnings_yield'])
+    display_data['roc'] = format_percent(display_data['roc'])
+    
+    display_data.columns = [
+        'Ticker', 'Company', 'Sector', 'Market Cap', 
+        'Earnings Yield', 'ROC', 'Quality Score', 'MF Rank'
+    ]
+    
+    st.dataframe(display_data.head(50), use_container_width=True)
+    
+    # Visualizations (plotly is only imported once there is something to chart).
+    # Figures are kept per session and keyed on the applied filters, so reruns
+    # that don't change the result set reuse them instead of rebuilding
+    if len(filtered_data) > 10:
+        import plotly.express as px
+        
+        figure_inputs = (
+            get_screening_csv_mtime(), min_market_cap, min_fscore,
+            min_ey, min_roc, tuple(selected_sectors)
+        )
+        
+        def build_sector_figure():
+            sector_dist = count_sectors(filtered_data['sector']).head(10)
+            fig = px.bar(
+                x=sector_dist.values, 
+                y=sector_dist.index,
+                orientation='h',
+                title="Top 10 Sectors by Stock Count"
+            )
+            fig.update_layout(height=400)
+            return fig
+        
+        def build_scatter_figure():
+            # WebGL keeps the full universe interactive; only very large
+            # result sets get downsampled to keep the first render fast
+            scatter_data = filtered_data
+            if len(scatter_data) > MAX_SCATTER_POINTS:
+                scatter_data = scatter_data.sample(MAX_SCATTER_POINTS, random_state=42)
+            
+            fig = px.scatter(
+                scatter_data,
+                x='earnings_yield',
+                y='roc',
+                color='f_score',
+                size='market_cap',
+                hover_data=['ticker', 'company_name'],
+                title="Earnings Yield vs ROC",
+                labels={
+                    'earnings_yield': 'Earnings Yield',
+                    'roc': 'Return on Capital',
+                    'f_score': 'Quality Score'
+                },
+                render_mode='webgl'
+            )
+            fig.update_layout(height=400)
+            return fig
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            # Sector distribution
+            fig_sector = get_session_figure('pro_sector_fig', figure_inputs, build_sector_figure)
+            st.plotly_chart(fig_sector, use_container_width=True)
+        
+        with col2:
+            # Earnings Yield vs ROC scatter
+            fig_scatter = get_session_figure('pro_scatter_fig', figure_inputs, build_scatter_figure)
+            st.plotly_chart(fig_scatter, use_container_width=True)
+
+render_footer()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Modern Magic Formula - Performance Tracking
+Paper trading simulation of the Magic Formula portfolio vs the S&P 500
+"""
+
+import streamlit as st
+import pandas as pd
+import numpy as np
+import plotly.express as px
+
+from _shared import (
+    cumulative_growth_and_volatility,
+    get_session_figure,
+    m4_downsample,
+    render_footer,
+    setup_page,
+)
+
+setup_page()
+
+# Performance tracking page
+st.title("📈 Performance Tracking")
+st.markdown("*Monitor your Magic Formula portfolio*")
+
+# Paper trading simulation
+st.subheader("📊 Paper Trading Simulation")
+
+# Mock performance data
+dates = pd.date_range(start='2024-01-01', end='2024-07-25', freq='D')
+np.random.seed(42)
+
+# Simulate returns
+mf_returns = np.random.normal(0.0008, 0.02, len(dates))  # Slightly positive drift
+spy_returns = np.random.normal(0.0005, 0.015, len(dates))
+
+# Both strategies in one (days x 2) array so growth and volatility are
+# computed in a single pass each
+cumulative, volatility = cumulative_growth_and_volatility(np.column_stack([mf_returns, spy_returns]))
+mf_cumulative, spy_cumulative = cumulative.T
+
+performance_df = pd.DataFrame({
+    'Date': dates,
+    'Magic Formula': mf_cumulative,
+    'S&P 500': spy_cumulative
+})
+
+# Performance chart - the simulation is seeded, so the figure only needs
+# building once per session
+def build_performance_figure():
+    fig = px.line(
+        m4_downsample(performance_df, ['Magic Formula', 'S&P 500']),
+        x='Date', 
+        y=['Magic Formula', 'S&P 500'],
+        title="Portfolio Performance Comparison (YTD)",
+        labels={'value': 'Cumulative Return', 'variable': 'Strategy'},
+        render_mode='webgl'
+    )
+    fig.update_layout(height=500)
+    return fig
+
+fig = get_session_figure('performance_fig', (dates[0], dates[-1]), build_performance_figure)
+st.plotly_chart(fig, use_container_width=True)
+
+# Performance metrics
+col1, col2, col3, col4 = st.columns(4)
+
+mf_total_return = (mf_cumulative[-1] - 1) * 100
+spy_total_return = (spy_cumulative[-1] - 1) * 100
+excess_return = mf_total_return - spy_total_return
+
+with col1:
+    st.metric("🎯 Magic Formula", f"{mf_total_return:+.1f}%")
+with col2:
+    st.metric("📊 S&P 500", f"{spy_total_return:+.1f}%")
+with col3:
+    st.metric("🏆 Excess Return", f"{excess_return:+.1f}%")
+with col4:
+    st.metric("📉 Volatility", f"{volatility[0] * 100:.1f}%")
+
+# Placeholder for future features
+st.markdown("---")
+st.info("📋 **Coming Soon**: Connect your brokerage account for live portfolio tracking")
+
+render_footer()
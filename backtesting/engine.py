@@ -14,12 +14,24 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 import yfinance as yf
 from dataclasses import dataclass
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import hashlib
+import logging
+import math
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from etl.realistic_costs import RealisticTransactionCosts
 from backtesting.risk_constraints import RiskConstraintManager
 
+logger = logging.getLogger(__name__)
+
+SCREENING_CSV = 'data/latest_screening.csv'
+
+# Screening columns the engine and risk constraints actually read
+BACKTEST_COLUMNS = ['ticker', 'company_name', 'sector', 'market_cap', 'magic_formula_rank']
+
 
 @dataclass
 class BacktestConfig:
@@ -33,6 +45,17 @@ class BacktestConfig:
     benchmark: str = "SPY"  # S&P 500 benchmark
     min_market_cap: float = 1e9  # $1B minimum market cap
     exclude_sectors: List[str] = None  # Sectors to exclude
+    use_price_cache: bool = True  # Reuse downloaded prices from price_cache_dir
+    price_cache_dir: str = "data/cache"
+    refresh_price_cache: bool = False  # Re-download and overwrite the cached prices
+    constraint_workers: int = 1  # >1 applies risk constraints for all rebalance dates in worker processes
+
+
+
+def _apply_risk_constraints(risk_manager: RiskConstraintManager, portfolio: pd.DataFrame,
+                            target_size: int) -> pd.DataFrame:
+    """Worker-process entry point for BacktestEngine.apply_risk_constraints_all"""
+    return risk_manager.apply_risk_constraints(portfolio, target_size=target_size)
 
 
 class BacktestEngine:
@@ -42,9 +65,21 @@ class BacktestEngine:
         self.config = config
         self.universe_data = None
         self.price_data = {}
+        self.price_matrix = None  # dates x tickers close prices (float32), tz-naive
+        # Daily returns of price_matrix as one contiguous (dates x tickers)
+        # array, with the date index and column lookup kept alongside
+        self.returns_array = None
+        self.dates = None
+        self.ticker_to_col = {}
         self.benchmark_data = None
+        # Rank-ordered universe with price data and its price_matrix columns
+        # (built once; each rebalance only masks it by listing date)
+        self._ranked_universe = None
+        self._ranked_cols = None
+        self._first_price_row = None  # per price_matrix column, first row with a close
         self.results = None
         self.cost_model = RealisticTransactionCosts()  # Initialize realistic cost model
+        self._cost_cache = {}  # (ticker, trade size bucket) -> cost estimate
         self.risk_manager = RiskConstraintManager()    # Initialize risk constraint manager
         
     def load_universe(self, screening_data: pd.DataFrame) -> None:
@@ -69,8 +104,9 @@ class BacktestEngine:
                 ~filtered_data['sector'].isin(self.config.exclude_sectors)
             ]
         
-        # Sort by magic formula rank and take top stocks for backtesting
-        self.universe_data = filtered_data.sort_values('magic_formula_rank').head(200)
+        # Take the best-ranked stocks for backtesting (partial sort, returned in rank order)
+        self.universe_data = filtered_data.nsmallest(200, 'magic_formula_rank')
+        self._ranked_universe = None
         
         print(f"✅ Universe loaded: {len(self.universe_data)} stocks")
         print(f"📈 Market cap range: ${self.universe_data['market_cap'].min()/1e9:.1f}B - ${self.universe_data['market_cap'].max()/1e9:.1f}B")
@@ -85,40 +121,89 @@ class BacktestEngine:
         if self.config.benchmark not in tickers:
             tickers.append(self.config.benchmark)
         
-        # Fetch data one ticker at a time to handle errors better
-        successful_downloads = 0
-        failed_tickers = []
+        # Prices for the same tickers and period are cached as Parquet, so
+        # repeat runs skip the download entirely
+        cache_path = self._price_cache_path(tickers) if self.config.use_price_cache else None
+        cache_hit = cache_path is not None and not self.config.refresh_price_cache and os.path.exists(cache_path)
         
-        for i, ticker in enumerate(tickers):
-            if i % 20 == 0:  # Progress update every 20 tickers
-                print(f"   Progress: {i}/{len(tickers)} tickers processed...")
-            
+        if cache_hit:
+            print(f"   Loading cached prices from {cache_path}")
+            closes = pd.read_parquet(cache_path)
+        else:
+            # One batched request for the whole universe; yfinance fans it out over
+            # its own thread pool instead of a serial round-trip per ticker
+            print(f"   Downloading {len(tickers)} tickers in one batch...")
             try:
-                # Fetch data for single ticker
-                stock = yf.Ticker(ticker)
-                data = stock.history(
+                raw = yf.download(
+                    tickers,
                     start=self.config.start_date,
                     end=self.config.end_date,
                     auto_adjust=True,
-                    actions=False
+                    actions=False,
+                    group_by='ticker',
+                    threads=True,
+                    progress=False
                 )
-                
-                if not data.empty and len(data) > 50:  # Need at least ~2 months of data
-                    self.price_data[ticker] = data['Close']
-                    successful_downloads += 1
-                else:
-                    failed_tickers.append(ticker)
-                    
             except Exception as e:
-                failed_tickers.append(ticker)
-                if len(failed_tickers) <= 5:  # Only show first 5 errors
-                    print(f"⚠️  Error fetching {ticker}: {str(e)[:100]}...")
-        
-        print(f"   Progress: {len(tickers)}/{len(tickers)} tickers processed...")
+                print(f"⚠️  Error fetching price data: {str(e)[:100]}...")
+                raw = pd.DataFrame()
+            
+            if isinstance(raw.columns, pd.MultiIndex) and 'Close' in raw.columns.get_level_values(1):
+                closes = raw.xs('Close', axis=1, level=1)
+            else:
+                closes = pd.DataFrame()
+            
+            # Store tz-naive so date comparisons elsewhere never need
+            # timezone handling
+            if isinstance(closes.index, pd.DatetimeIndex) and closes.index.tz is not None:
+                closes.index = closes.index.tz_localize(None)
+        
+        # Need at least ~2 months of data (cached matrices were already filtered)
+        observations = closes.notna().sum()
+        min_observations = 0 if cache_hit else 50
+        kept = [ticker for ticker in dict.fromkeys(tickers)
+                if ticker in observations.index and observations[ticker] > min_observations]
+        kept_set = set(kept)
+        failed_tickers = [ticker for ticker in tickers if ticker not in kept_set]
         
         if failed_tickers:
             print(f"⚠️  Failed to fetch data for {len(failed_tickers)} tickers: {failed_tickers[:10]}{'...' if len(failed_tickers) > 10 else ''}")
         
+        self._ranked_universe = None
+        
+        if kept:
+            # Wide (dates x tickers) close matrix so each rebalance period is a
+            # single slice. The batched frame is already aligned on dates, so it
+            # is copied once into a float32 block by column position rather than
+            # rebuilt from per-ticker series; float32 is ample for daily closes
+            # and metrics promote back to float64 before compounding
+            values = np.empty((len(closes.index), len(kept)), dtype=np.float32)
+            for col, ticker in enumerate(kept):
+                values[:, col] = closes[ticker].to_numpy(dtype=np.float32, na_value=np.nan)
+            has_price = ~np.isnan(values).all(axis=1)
+            self.price_matrix = pd.DataFrame(
+                values[has_price], index=closes.index[has_price], columns=kept
+            ).sort_index()
+            
+            for ticker in kept:
+                self.price_data[ticker] = closes[ticker].dropna()
+            
+            # Daily returns for every ticker, computed once; rebalance periods
+            # only slice it (gaps carry the last close forward, as before)
+            self.returns_array = np.ascontiguousarray(
+                self.price_matrix.ffill().pct_change(fill_method=None).to_numpy()
+            )
+            self.dates = self.price_matrix.index
+            self.ticker_to_col = {ticker: col for col, ticker in enumerate(self.price_matrix.columns)}
+            self._first_price_row = self.price_matrix.notna().to_numpy().argmax(axis=0)
+            
+            if cache_path is not None and not cache_hit:
+                try:
+                    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+                    self.price_matrix.to_parquet(cache_path, compression='zstd')
+                except Exception as e:
+                    print(f"⚠️  Could not write price cache: {e}")
+        
         # Extract benchmark data
         if self.config.benchmark in self.price_data:
             self.benchmark_data = self.price_data[self.config.benchmark]
@@ -131,6 +216,12 @@ class BacktestEngine:
         if successful_tickers < 10:
             print(f"⚠️  Warning: Only {successful_tickers} stocks have price data. Consider adjusting date range or stock selection.")
         
+    def _price_cache_path(self, tickers: List[str]) -> str:
+        """Parquet cache file for a ticker set and the configured date range."""
+        key_source = ','.join(sorted(tickers)) + self.config.start_date + self.config.end_date
+        key = hashlib.md5(key_source.encode()).hexdigest()[:12]
+        return os.path.join(self.config.price_cache_dir, f"prices_{key}.parquet")
+        
     def create_portfolio_rankings(self, as_of_date: datetime) -> pd.DataFrame:
         """
         Create portfolio rankings as of a specific date using our Modern Magic Formula.
@@ -144,41 +235,28 @@ class BacktestEngine:
         Returns:
             DataFrame with stocks ranked by our Modern Magic Formula
         """
-        # For now, use current rankings but could add time-based adjustments
-        rankings = self.universe_data.copy()
-        
-        # Filter to stocks with available price data at the given date
-        available_stocks = []
-        for ticker in rankings['ticker']:
-            if ticker in self.price_data:
-                prices = self.price_data[ticker]
-                # Convert as_of_date to pandas timestamp and handle timezone
-                as_of_ts = pd.Timestamp(as_of_date)
-                if prices.index.tz is not None:
-                    # If prices have timezone, localize our timestamp
-                    as_of_ts = as_of_ts.tz_localize(prices.index.tz)
-                elif as_of_ts.tz is not None:
-                    # If our timestamp has timezone but prices don't, remove it
-                    as_of_ts = as_of_ts.tz_localize(None)
-                
-                try:
-                    # Check if we have any price data around the date
-                    if len(prices) > 0 and (as_of_ts in prices.index or any(prices.index <= as_of_ts)):
-                        available_stocks.append(ticker)
-                    elif len(prices) > 0:
-                        # If we have price data but date comparison fails, include it anyway
-                        available_stocks.append(ticker)
-                except (TypeError, ValueError):
-                    # If comparison still fails, just include the stock if it has data
-                    if len(prices) > 0:
-                        available_stocks.append(ticker)
-        
-        rankings = rankings[rankings['ticker'].isin(available_stocks)]
+        # For now, use current rankings but could add time-based adjustments.
+        # The rank order never changes, so the candidates (universe_data is
+        # already sorted by rank) are resolved to price columns only once
+        if self._ranked_universe is None:
+            rankings = self.universe_data
+            rankings = rankings[rankings['ticker'].isin(self.ticker_to_col.keys())]
+            self._ranked_universe = rankings
+            self._ranked_cols = np.fromiter(
+                (self.ticker_to_col[ticker] for ticker in rankings['ticker']),
+                dtype=np.int64,
+                count=len(rankings)
+            )
+        
+        # Filter to stocks already trading at the first session on or after
+        # as_of_date - one searchsorted for the date, one comparison for all
+        # candidates
+        as_of_row = min(int(self.dates.searchsorted(pd.Timestamp(as_of_date))), len(self.dates) - 1)
+        trading = self._first_price_row[self._ranked_cols] <= as_of_row
         
         # Could add momentum adjustment based on historical performance up to as_of_date
         # For now, use the current quality rankings
-        
-        return rankings.sort_values('magic_formula_rank').head(self.config.portfolio_size)
+        return self._ranked_universe[trading].head(self.config.portfolio_size)
         
     def get_rebalance_dates(self) -> List[datetime]:
         """Generate rebalancing dates based on frequency setting."""
@@ -215,43 +293,28 @@ class BacktestEngine:
             print(f"   ⚠️  No stocks available for portfolio on {start_date}")
             return pd.Series(dtype=float)
             
-        weights = 1.0 / len(tickers)  # Equal weighting
-        portfolio_returns = pd.Series(dtype=float)
-        
-        # Get price data for the period
-        all_prices = pd.DataFrame()
-        start_ts = pd.Timestamp(start_date)
-        end_ts = pd.Timestamp(end_date)
-        
-        for ticker in tickers:
-            if ticker in self.price_data:
-                prices = self.price_data[ticker]
-                
-                # Handle timezone compatibility
-                if prices.index.tz is not None:
-                    start_ts_adj = start_ts.tz_localize(prices.index.tz) if start_ts.tz is None else start_ts
-                    end_ts_adj = end_ts.tz_localize(prices.index.tz) if end_ts.tz is None else end_ts
-                else:
-                    start_ts_adj = start_ts.tz_localize(None) if start_ts.tz is not None else start_ts
-                    end_ts_adj = end_ts.tz_localize(None) if end_ts.tz is not None else end_ts
-                
-                try:
-                    mask = (prices.index >= start_ts_adj) & (prices.index <= end_ts_adj)
-                    ticker_prices = prices[mask]
-                    if len(ticker_prices) > 0:
-                        all_prices[ticker] = ticker_prices
-                except (TypeError, ValueError):
-                    # If comparison fails, include all prices for this ticker
-                    all_prices[ticker] = prices
-        
-        if all_prices.empty:
-            return pd.Series(dtype=float)
-            
-        # Calculate returns for each stock
-        returns = all_prices.pct_change().dropna()
+        # Daily returns after start_date through end_date - the close on
+        # start_date belongs to the previous period, so boundary days are
+        # counted exactly once. Stocks without prices yet are skipped in
+        # the equal-weighted mean, dates where none of them traded dropped
+        cols = np.fromiter(
+            (self.ticker_to_col[ticker] for ticker in tickers if ticker in self.ticker_to_col),
+            dtype=np.int64
+        )
+        first_row, end_row = self.dates.searchsorted(
+            [pd.Timestamp(start_date), pd.Timestamp(end_date)], side='right'
+        )
+        returns = self.returns_array[first_row:end_row, cols]
         
         # Equal-weighted portfolio returns
-        portfolio_returns = returns.mean(axis=1)
+        valid = ~np.isnan(returns)
+        counts = valid.sum(axis=1)
+        totals = np.where(valid, returns, 0.0).sum(axis=1)
+        traded = counts > 0
+        portfolio_returns = pd.Series(
+            totals[traded] / counts[traded],
+            index=self.dates[first_row:end_row][traded]
+        )
         
         return portfolio_returns
         
@@ -276,28 +339,28 @@ class BacktestEngine:
         rebalance_dates = self.get_rebalance_dates()
         print(f"   📅 Rebalancing {len(rebalance_dates)} times")
         
-        # Track portfolio performance
-        all_returns = pd.Series(dtype=float)
+        # Track portfolio performance (period returns are joined once after the loop)
+        return_chunks = []
         portfolio_history = []
         transaction_costs = 0.0
         
+        # Rankings for every period, then risk constraints (independent per date)
+        initial_portfolios = [self.create_portfolio_rankings(date) for date in rebalance_dates]
+        constrained_portfolios = self.apply_risk_constraints_all(initial_portfolios)
+        
         for i, rebalance_date in enumerate(rebalance_dates):
-            print(f"\n📊 Rebalance {i+1}/{len(rebalance_dates)}: {rebalance_date.strftime('%Y-%m-%d')}")
+            logger.info("📊 Rebalance %d/%d: %s", i + 1, len(rebalance_dates), rebalance_date.strftime('%Y-%m-%d'))
             
-            # Create portfolio for this period with risk constraints
-            initial_portfolio = self.create_portfolio_rankings(rebalance_date)
-            print(f"   📊 Initial selection: {len(initial_portfolio)} stocks")
+            initial_portfolio = initial_portfolios[i]
+            logger.info("   📊 Initial selection: %d stocks", len(initial_portfolio))
             
-            # Apply risk constraints
-            try:
-                constrained_portfolio = self.risk_manager.apply_risk_constraints(
-                    initial_portfolio, target_size=self.config.portfolio_size
-                )
-                portfolio = constrained_portfolio
-                print(f"   🛡️  Risk-constrained portfolio: {len(portfolio)} stocks")
-            except Exception as e:
-                print(f"   ⚠️  Risk constraint failed, using unconstrained: {e}")
+            constrained_portfolio = constrained_portfolios[i]
+            if isinstance(constrained_portfolio, Exception):
+                logger.warning("Risk constraint failed, using unconstrained: %s", constrained_portfolio)
                 portfolio = initial_portfolio.head(self.config.portfolio_size)
+            else:
+                portfolio = constrained_portfolio
+                logger.info("   🛡️  Risk-constrained portfolio: %d stocks", len(portfolio))
             
             # Calculate end date for this period
             if i < len(rebalance_dates) - 1:
@@ -316,11 +379,11 @@ class BacktestEngine:
                     if len(period_returns) > 0:
                         period_returns.iloc[0] -= period_transaction_cost
                         transaction_costs += period_transaction_cost
-                        print(f"   💰 Transaction cost: {period_transaction_cost*100:.2f}%")
+                        logger.info("   💰 Transaction cost: %.2f%%", period_transaction_cost * 100)
                 
-                all_returns = pd.concat([all_returns, period_returns])
+                return_chunks.append(period_returns)
                 
-                print(f"   📈 Period return: {period_returns.sum()*100:.2f}%")
+                logger.info("   📈 Period return: %.2f%%", period_returns.sum() * 100)
             
             # Store portfolio for analysis - use available columns
             portfolio_cols = ['ticker', 'magic_formula_rank']
@@ -336,24 +399,14 @@ class BacktestEngine:
                 'portfolio': portfolio[portfolio_cols].copy()
             })
         
+        all_returns = pd.concat(return_chunks) if return_chunks else pd.Series(dtype=float)
+        
         # Calculate benchmark returns
         benchmark_returns = None
         if self.benchmark_data is not None:
-            try:
-                start_dt = pd.to_datetime(self.config.start_date)
-                end_dt = pd.to_datetime(self.config.end_date)
-                
-                # Handle timezone compatibility
-                if self.benchmark_data.index.tz is not None:
-                    start_dt = start_dt.tz_localize(self.benchmark_data.index.tz)
-                    end_dt = end_dt.tz_localize(self.benchmark_data.index.tz)
-                
-                mask = (self.benchmark_data.index >= start_dt) & (self.benchmark_data.index <= end_dt)
-                benchmark_prices = self.benchmark_data[mask]
-                benchmark_returns = benchmark_prices.pct_change().dropna()
-            except (TypeError, ValueError):
-                # If timezone handling fails, use all benchmark data
-                benchmark_returns = self.benchmark_data.pct_change().dropna()
+            # One label slice of the sorted, tz-naive benchmark series
+            benchmark_prices = self.benchmark_data.loc[self.config.start_date:self.config.end_date]
+            benchmark_returns = benchmark_prices.pct_change().dropna()
         
         # Store results
         self.results = {
@@ -370,6 +423,44 @@ class BacktestEngine:
         
         return self.results
     
+    def apply_risk_constraints_all(self, portfolios: List[pd.DataFrame]) -> List:
+        """
+        Apply risk constraints to the portfolio of every rebalance date.
+        
+        With config.constraint_workers > 1 the dates are spread over worker
+        processes; betas for all candidates are fetched once up front so the
+        workers read them from the shared on-disk beta cache.
+        
+        Returns:
+            One entry per input portfolio: the constrained DataFrame, or the
+            exception raised while constraining it
+        """
+        target_size = self.config.portfolio_size
+        workers = min(self.config.constraint_workers, len(portfolios))
+        
+        if workers <= 1:
+            results = []
+            for portfolio in portfolios:
+                try:
+                    results.append(self.risk_manager.apply_risk_constraints(portfolio, target_size=target_size))
+                except Exception as e:
+                    results.append(e)
+            return results
+        
+        if self.risk_manager.beta_cache_dir is not None:
+            candidates = pd.concat([portfolio['ticker'].head(target_size * 2) for portfolio in portfolios])
+            try:
+                self.risk_manager.compute_betas_batch(candidates.drop_duplicates().tolist())
+            except Exception as e:
+                logger.warning("Could not prefetch betas: %s", e)
+        
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(_apply_risk_constraints, self.risk_manager, portfolio, target_size)
+                for portfolio in portfolios
+            ]
+            return [future.exception() or future.result() for future in futures]
+    
     def calculate_realistic_transaction_costs(self, portfolio: pd.DataFrame) -> float:
         """
         Calculate realistic transaction costs for portfolio rebalancing.
@@ -384,19 +475,24 @@ class BacktestEngine:
             # Equal weight allocation
             position_size = self.config.initial_capital / len(portfolio)
             
-            # Get transaction costs for each stock
-            costs = []
-            for _, stock in portfolio.iterrows():
-                ticker = stock['ticker']
-                cost_data = self.cost_model.estimate_total_cost(ticker, position_size)
-                if cost_data['data_available']:
-                    costs.append(cost_data['total_cost'])
-                else:
-                    # Use fallback cost for missing data
-                    costs.append(self.config.transaction_cost)
+            # Get transaction costs for each stock - every estimate is a yfinance
+            # round-trip, so overlap them on a small thread pool
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                cost_results = list(executor.map(
+                    lambda ticker: self._cost_for(ticker, position_size),
+                    portfolio['ticker'].tolist()
+                ))
+            
+            # Fill one float array, using the fallback cost for missing data
+            costs = np.fromiter(
+                (cost_data['total_cost'] if cost_data['data_available'] else self.config.transaction_cost
+                 for cost_data in cost_results),
+                dtype=np.float64,
+                count=len(cost_results)
+            )
             
             # Return weighted average cost
-            avg_cost = np.mean(costs) if costs else self.config.transaction_cost
+            avg_cost = costs.mean() if costs.size else self.config.transaction_cost
             return avg_cost
             
         except Exception as e:
@@ -404,10 +500,40 @@ class BacktestEngine:
             return self.config.transaction_cost  # Fallback to simple cost
 
 
-def load_current_screening_data() -> pd.DataFrame:
-    """Load the current screening data for backtesting."""
+    def _cost_for(self, ticker: str, position_size: float) -> Dict:
+        """
+        Cost estimate for one trade, memoized across rebalances.
+        
+        Holdings repeat heavily between rebalances, so estimates are cached
+        per ticker and trade size rounded to 5% steps.
+        """
+        key = (ticker, round(math.log(position_size) / math.log(1.05)))
+        if key not in self._cost_cache:
+            self._cost_cache[key] = self.cost_model.estimate_total_cost(ticker, position_size)
+        return self._cost_cache[key]
+
+
+@lru_cache(maxsize=4)
+def _read_screening_csv(path: str, mtime: float, columns: Optional[Tuple[str, ...]] = None) -> pd.DataFrame:
+    """Parse the screening CSV once per file version (mtime is the cache key)."""
+    if columns is None:
+        return pd.read_csv(path)
+    # Projected reads go through the pyarrow parser, which never converts
+    # the columns that were not asked for
+    return pd.read_csv(path, engine='pyarrow', usecols=list(columns))
+
+
+def load_current_screening_data(columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """Load the current screening data for backtesting.
+    
+    Args:
+        columns: Only load these columns (e.g. BACKTEST_COLUMNS); all when None
+    """
     try:
-        data = pd.read_csv('data/latest_screening.csv')
+        # Repeat calls in one process (parameter sweeps) reuse the parsed
+        # table until the CSV is rewritten; callers get their own copy
+        key = tuple(columns) if columns is not None else None
+        data = _read_screening_csv(SCREENING_CSV, os.path.getmtime(SCREENING_CSV), key).copy()
         print(f"📊 Loaded screening data: {len(data)} stocks")
         return data
     except FileNotFoundError:
@@ -15,6 +15,13 @@ from typing import Dict, Optional, Tuple
 from scipy import stats
 
 
+def _annualized_return(returns: np.ndarray, trading_days: int = 252) -> float:
+    """Geometric annualized return of an array of daily returns."""
+    total_return = np.exp(np.nansum(np.log1p(returns))) - 1
+    years = returns.size / trading_days
+    return (1 + total_return) ** (1/years) - 1 if years > 0 else 0
+
+
 def calculate_returns_metrics(returns: pd.Series) -> Dict:
     """
     Calculate comprehensive return metrics.
@@ -25,19 +32,23 @@ def calculate_returns_metrics(returns: pd.Series) -> Dict:
     Returns:
         Dict with return metrics
     """
-    if len(returns) == 0:
+    # Every statistic below is a reduction over the same flat array
+    # (NaN-aware, matching the pandas reductions it replaces)
+    r = np.asarray(returns, dtype=np.float64)
+    n = r.size
+    if n == 0:
         return {}
     
-    # Basic return metrics
-    total_return = (1 + returns).prod() - 1
+    # Basic return metrics (log-sum avoids overflow on long series)
+    total_return = np.exp(np.nansum(np.log1p(r))) - 1
     
     # Annualized metrics (assuming daily returns)
     trading_days = 252
-    years = len(returns) / trading_days
+    years = n / trading_days
     annualized_return = (1 + total_return) ** (1/years) - 1 if years > 0 else 0
     
     # Volatility
-    daily_vol = returns.std()
+    daily_vol = np.nanstd(r, ddof=1) if n > 1 else np.nan
     annualized_vol = daily_vol * np.sqrt(trading_days)
     
     # Sharpe ratio (assuming risk-free rate of 2%)
@@ -46,11 +57,11 @@ def calculate_returns_metrics(returns: pd.Series) -> Dict:
     sharpe_ratio = excess_return / annualized_vol if annualized_vol > 0 else 0
     
     # Win rate
-    win_rate = (returns > 0).mean()
+    win_rate = (r > 0).mean()
     
     # Best and worst periods
-    best_day = returns.max()
-    worst_day = returns.min()
+    best_day = np.nanmax(r)
+    worst_day = np.nanmin(r)
     
     return {
         'total_return': total_return,
@@ -60,7 +71,7 @@ def calculate_returns_metrics(returns: pd.Series) -> Dict:
         'win_rate': win_rate,
         'best_day': best_day,
         'worst_day': worst_day,
-        'total_days': len(returns)
+        'total_days': n
     }
 
 
@@ -77,30 +88,37 @@ def calculate_drawdown_metrics(returns: pd.Series) -> Dict:
     if len(returns) == 0:
         return {}
     
-    # Calculate cumulative returns
-    cumulative = (1 + returns).cumprod()
-    
-    # Calculate running maximum (peak)
-    running_max = cumulative.expanding().max()
-    
-    # Calculate drawdown
+    # Cumulative growth, running peak and drawdown as flat arrays (one scan
+    # each) instead of a chain of pandas Series. Missing returns are skipped
+    # like pandas' cumprod: growth carries through them and their own
+    # drawdown entry stays NaN (fmax ignores NaN, like expanding().max())
+    r = returns.to_numpy(dtype=float)
+    missing = np.isnan(r)
+    cumulative = np.cumprod(1 + np.where(missing, 0.0, r))
+    cumulative[missing] = np.nan
+    running_max = np.fmax.accumulate(cumulative)
     drawdown = (cumulative - running_max) / running_max
     
-    # Maximum drawdown
-    max_drawdown = drawdown.min()
+    if missing.all():
+        return {
+            'max_drawdown': np.nan,
+            'max_drawdown_date': None,
+            'recovery_time_days': None,
+            'avg_drawdown': 0,
+            'drawdown_series': pd.Series(drawdown, index=returns.index)
+        }
     
-    # Find maximum drawdown period
-    max_dd_idx = drawdown.idxmin()
+    # Maximum drawdown and when it happened
+    max_dd_pos = int(np.nanargmin(drawdown))
+    max_drawdown = drawdown[max_dd_pos]
+    max_dd_idx = returns.index[max_dd_pos]
     
     # Calculate recovery time (days to recover from max drawdown)
     recovery_time = None
-    if max_dd_idx is not None:
-        peak_before_dd = running_max.loc[max_dd_idx]
-        recovery_series = cumulative[cumulative.index > max_dd_idx]
-        recovery_idx = recovery_series[recovery_series >= peak_before_dd].index
-        
-        if len(recovery_idx) > 0:
-            recovery_time = (recovery_idx[0] - max_dd_idx).days
+    recovered = cumulative[max_dd_pos + 1:] >= running_max[max_dd_pos]
+    if recovered.any():
+        recovery_idx = returns.index[max_dd_pos + 1 + int(recovered.argmax())]
+        recovery_time = (recovery_idx - max_dd_idx).days
     
     # Average drawdown
     negative_dd = drawdown[drawdown < 0]
@@ -111,7 +129,7 @@ def calculate_drawdown_metrics(returns: pd.Series) -> Dict:
         'max_drawdown_date': max_dd_idx,
         'recovery_time_days': recovery_time,
         'avg_drawdown': avg_drawdown,
-        'drawdown_series': drawdown
+        'drawdown_series': pd.Series(drawdown, index=returns.index)
     }
 
 
@@ -129,44 +147,45 @@ def calculate_benchmark_metrics(returns: pd.Series, benchmark_returns: pd.Series
     if len(returns) == 0 or len(benchmark_returns) == 0:
         return {}
     
-    # Align dates
-    aligned_data = pd.DataFrame({
-        'portfolio': returns,
-        'benchmark': benchmark_returns
-    }).dropna()
+    # Align dates on plain arrays (common dates, both values present)
+    common_dates = returns.index.intersection(benchmark_returns.index)
+    portfolio_aligned = returns.reindex(common_dates).to_numpy(dtype=float)
+    benchmark_aligned = benchmark_returns.reindex(common_dates).to_numpy(dtype=float)
+    valid = ~(np.isnan(portfolio_aligned) | np.isnan(benchmark_aligned))
+    portfolio_aligned = portfolio_aligned[valid]
+    benchmark_aligned = benchmark_aligned[valid]
     
-    if len(aligned_data) < 30:  # Need minimum data points
+    if len(portfolio_aligned) < 30:  # Need minimum data points
         return {}
     
-    portfolio_aligned = aligned_data['portfolio']
-    benchmark_aligned = aligned_data['benchmark']
-    
-    # Calculate beta and alpha
-    covariance = np.cov(portfolio_aligned, benchmark_aligned)[0, 1]
-    benchmark_variance = np.var(benchmark_aligned)
-    beta = covariance / benchmark_variance if benchmark_variance > 0 else 0
+    # Calculate beta and alpha - one least-squares fit of portfolio on
+    # benchmark gives beta (slope) and correlation (r) together
+    if np.ptp(benchmark_aligned) > 0:
+        regression = stats.linregress(benchmark_aligned, portfolio_aligned)
+        beta = regression.slope
+        correlation = regression.rvalue
+    else:
+        beta = 0
+        correlation = np.nan
     
     # Alpha calculation
-    portfolio_return = calculate_returns_metrics(portfolio_aligned)['annualized_return']
-    benchmark_return = calculate_returns_metrics(benchmark_aligned)['annualized_return']
+    portfolio_return = _annualized_return(portfolio_aligned)
+    benchmark_return = _annualized_return(benchmark_aligned)
     risk_free_rate = 0.02
     
     alpha = portfolio_return - (risk_free_rate + beta * (benchmark_return - risk_free_rate))
     
-    # Correlation
-    correlation = portfolio_aligned.corr(benchmark_aligned)
-    
     # Information ratio (excess return / tracking error)
     excess_returns = portfolio_aligned - benchmark_aligned
-    tracking_error = excess_returns.std() * np.sqrt(252)  # Annualized
+    tracking_error = excess_returns.std(ddof=1) * np.sqrt(252)  # Annualized
     information_ratio = excess_returns.mean() * 252 / tracking_error if tracking_error > 0 else 0
     
     # Up/down capture ratios
     up_periods = benchmark_aligned > 0
     down_periods = benchmark_aligned < 0
     
-    up_capture = (portfolio_aligned[up_periods].mean() / benchmark_aligned[up_periods].mean()) if up_periods.sum() > 0 else 0
-    down_capture = (portfolio_aligned[down_periods].mean() / benchmark_aligned[down_periods].mean()) if down_periods.sum() > 0 else 0
+    up_capture = (portfolio_aligned[up_periods].mean() / benchmark_aligned[up_periods].mean()) if up_periods.any() else 0
+    down_capture = (portfolio_aligned[down_periods].mean() / benchmark_aligned[down_periods].mean()) if down_periods.any() else 0
     
     return {
         'alpha': alpha,
@@ -17,80 +17,138 @@ in specific risk factors that could lead to poor performance.
 import pandas as pd
 import numpy as np
 import yfinance as yf
+from curl_cffi import requests as curl_requests
+import logging
+import os
+from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
+from types import MappingProxyType
 import warnings
 warnings.filterwarnings('ignore')
 
+logger = logging.getLogger(__name__)
+
+# Market cap segment thresholds: <$1B micro, $1B-$5B small, $5B-$50B mid, $50B+ large
+MARKET_CAP_BINS = np.array([1e9, 5e9, 50e9])
+MARKET_CAP_SEGMENTS = np.array(['micro_cap', 'small_cap', 'mid_cap', 'large_cap'], dtype=object)
+
+
+def _label_weights(labels: pd.Series) -> Dict[str, float]:
+    """Equal-weight share of each label, counted with one bincount over factorized codes
+    
+    Ordered like value_counts (largest share first, ties as value_counts
+    breaks them), so violation messages list the heaviest labels first.
+    """
+    codes, uniques = pd.factorize(labels)
+    counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+    weights = pd.Series(counts / len(labels), index=uniques).sort_values(ascending=False)
+    return dict(zip(weights.index, weights.to_numpy()))
+
+
+@dataclass
+class PortfolioState:
+    """Running totals for a portfolio built one equal-weight position at a time"""
+    sector_counts: np.ndarray
+    size_counts: np.ndarray
+    positions: List[int] = field(default_factory=list)
+    beta_sum: float = 0.0
+    
+    @property
+    def n(self) -> int:
+        return len(self.positions)
+    
+    @property
+    def mean_beta(self) -> float:
+        return self.beta_sum / self.n if self.n else float('nan')
+    
+    def mean_beta_with(self, beta: float) -> float:
+        """Portfolio beta if one more position with this beta were added"""
+        return (self.beta_sum + beta) / (self.n + 1)
+    
+    def add(self, position: int, sector_code: int, size_code: int, beta: float) -> None:
+        self.positions.append(position)
+        self.sector_counts[sector_code] += 1
+        self.size_counts[size_code] += 1
+        self.beta_sum += beta
+
 
 class RiskConstraintManager:
     """Manage portfolio risk constraints for backtesting"""
     
-    def __init__(self):
-        self.sector_limits = {
-            'Information Technology': 0.35,    # Max 35% in tech (reflects market reality)
-            'Health Care': 0.25,               # Max 25% in healthcare
-            'Financials': 0.25,                # Max 25% in financials
-            'Consumer Discretionary': 0.20,    # Max 20% in consumer disc
-            'Industrials': 0.20,               # Max 20% in industrials
-            'Communication Services': 0.15,    # Max 15% in communications
-            'Consumer Staples': 0.15,          # Max 15% in consumer staples
-            'Energy': 0.15,                    # Max 15% in energy
-            'Materials': 0.12,                 # Max 12% in materials
-            'Real Estate': 0.12,               # Max 12% in real estate
-            'Utilities': 0.10                  # Max 10% in utilities
-        }
-        
-        self.size_limits = {
-            'large_cap': (0.30, 0.70),    # 30-70% in large cap (>$50B)
-            'mid_cap': (0.20, 0.50),      # 20-50% in mid cap ($5B-$50B)
-            'small_cap': (0.05, 0.30)     # 5-30% in small cap ($1B-$5B)
-        }
+    SECTOR_LIMITS = MappingProxyType({
+        'Information Technology': 0.35,    # Max 35% in tech (reflects market reality)
+        'Health Care': 0.25,               # Max 25% in healthcare
+        'Financials': 0.25,                # Max 25% in financials
+        'Consumer Discretionary': 0.20,    # Max 20% in consumer disc
+        'Industrials': 0.20,               # Max 20% in industrials
+        'Communication Services': 0.15,    # Max 15% in communications
+        'Consumer Staples': 0.15,          # Max 15% in consumer staples
+        'Energy': 0.15,                    # Max 15% in energy
+        'Materials': 0.12,                 # Max 12% in materials
+        'Real Estate': 0.12,               # Max 12% in real estate
+        'Utilities': 0.10                  # Max 10% in utilities
+    })
+    
+    SIZE_LIMITS = MappingProxyType({
+        'large_cap': (0.30, 0.70),    # 30-70% in large cap (>$50B)
+        'mid_cap': (0.20, 0.50),      # 20-50% in mid cap ($5B-$50B)
+        'small_cap': (0.05, 0.30)     # 5-30% in small cap ($1B-$5B)
+    })
+    
+    BETA_LIMITS = (0.5, 1.5)        # Portfolio beta between 0.5-1.5
+    
+    def __init__(self, beta_cache_dir: Optional[str] = "data/cache"):
+        # Per-manager copies of the default limits; replacing or editing them
+        # changes what this manager enforces
+        self.sector_limits = dict(self.SECTOR_LIMITS)
+        self.size_limits = dict(self.SIZE_LIMITS)
+        self.beta_limits = self.BETA_LIMITS
+        
+        # Betas are cached on disk per trading day (None disables the cache)
+        self.beta_cache_dir = beta_cache_dir
+        # One pooled session (HTTP/2, browser TLS fingerprint as yfinance requires)
+        # so every Yahoo call reuses connections instead of handshaking per ticker
+        self.session = curl_requests.Session(impersonate="chrome")
         
-        self.beta_limits = (0.5, 1.5)        # Portfolio beta between 0.5-1.5
         self.max_position_size = 0.08         # Max 8% in any single stock
         self.min_position_count = 15          # Minimum 15 stocks in portfolio
         
+        # Per-ticker closes and aligned (stock, SPY) returns for get_stock_beta,
+        # keyed by (ticker, start, end) so SPY is fetched and differenced once
+        self._price_cache: Dict[Tuple[str, str, str], pd.Series] = {}
+        self._returns_cache: Dict[Tuple[str, str, str], Optional[np.ndarray]] = {}
+        
+    def __getstate__(self):
+        # The HTTP session holds thread-local handles; rebuild it after unpickling
+        # so the manager can be shipped to worker processes
+        state = self.__dict__.copy()
+        del state['session']
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.session = curl_requests.Session(impersonate="chrome")
+    
     def get_stock_beta(self, ticker: str, days: int = 252) -> float:
         """Calculate stock beta vs. SPY over specified period"""
         try:
-            # Get stock and market data
+            # Get stock and market returns (cached per ticker and date range)
             end_date = datetime.now()
             start_date = end_date - timedelta(days=days + 50)  # Extra buffer
+            key = (ticker, f"{start_date:%Y-%m-%d}", f"{end_date:%Y-%m-%d}")
             
-            stock = yf.Ticker(ticker)
-            spy = yf.Ticker('SPY')
-            
-            stock_data = stock.history(start=start_date, end=end_date)
-            spy_data = spy.history(start=start_date, end=end_date)
+            if key not in self._returns_cache:
+                self._returns_cache[key] = self._aligned_returns(ticker, key[1], key[2], days)
+            returns = self._returns_cache[key]
             
-            if len(stock_data) < 100 or len(spy_data) < 100:
+            if returns is None or len(returns) < 50:
                 return 1.0  # Default beta if insufficient data
             
-            # Align dates and calculate returns
-            common_dates = stock_data.index.intersection(spy_data.index)[-days:]
-            
-            if len(common_dates) < 100:
-                return 1.0
-                
-            stock_prices = stock_data.loc[common_dates, 'Close']
-            spy_prices = spy_data.loc[common_dates, 'Close']
-            
-            # Calculate daily returns
-            stock_returns = stock_prices.pct_change().dropna()
-            spy_returns = spy_prices.pct_change().dropna()
-            
             # Calculate beta using covariance
-            aligned_data = pd.DataFrame({
-                'stock': stock_returns,
-                'spy': spy_returns
-            }).dropna()
-            
-            if len(aligned_data) < 50:
-                return 1.0
-                
-            covariance = aligned_data['stock'].cov(aligned_data['spy'])
-            spy_variance = aligned_data['spy'].var()
+            stock_returns, spy_returns = returns[:, 0], returns[:, 1]
+            covariance = np.cov(stock_returns, spy_returns)[0, 1]
+            spy_variance = spy_returns.var(ddof=1)
             
             beta = covariance / spy_variance if spy_variance > 0 else 1.0
             
@@ -100,91 +158,242 @@ class RiskConstraintManager:
             return float(beta)
             
         except Exception as e:
-            print(f"   ⚠️  Error calculating beta for {ticker}: {e}")
+            logger.warning("Error calculating beta for %s: %s", ticker, e)
             return 1.0  # Default beta
     
+    def _aligned_returns(self, ticker: str, start: str, end: str, days: int) -> Optional[np.ndarray]:
+        """Daily (stock, SPY) return pairs over the last `days` shared trading days
+        
+        Returns None when either history is shorter than 100 days.
+        """
+        stock_prices = self._close_history(ticker, start, end)
+        spy_prices = self._close_history('SPY', start, end)
+        
+        if len(stock_prices) < 100 or len(spy_prices) < 100:
+            return None
+        
+        # Align dates and calculate returns
+        common_dates = stock_prices.index.intersection(spy_prices.index)[-days:]
+        
+        if len(common_dates) < 100:
+            return None
+        
+        aligned_data = pd.DataFrame({
+            'stock': stock_prices.loc[common_dates].pct_change(),
+            'spy': spy_prices.loc[common_dates].pct_change()
+        }).dropna()
+        
+        return aligned_data.to_numpy(dtype=np.float64)
+    
+    def _close_history(self, ticker: str, start: str, end: str) -> pd.Series:
+        """Daily closes from Yahoo, downloaded once per ticker and date range (SPY is shared)"""
+        key = (ticker, start, end)
+        if key not in self._price_cache:
+            history = yf.Ticker(ticker, session=self.session).history(start=start, end=end)
+            self._price_cache[key] = history['Close']
+        return self._price_cache[key]
+    
+    def compute_betas_batch(self, tickers: List[str], days: int = 252) -> np.ndarray:
+        """Betas vs. SPY for many stocks, reusing today's on-disk beta cache
+        
+        Only tickers without a cached beta for the current day (and lookback)
+        are downloaded; the cache file is then updated with them.
+        """
+        if self.beta_cache_dir is None or len(tickers) == 0:
+            return self._download_betas(tickers, days)
+        
+        cache_path = os.path.join(
+            self.beta_cache_dir, f"betas_{datetime.now():%Y-%m-%d}_{days}d.parquet"
+        )
+        cached = pd.Series(dtype=np.float64)
+        if os.path.exists(cache_path):
+            try:
+                cached = pd.read_parquet(cache_path)['beta']
+            except Exception as e:
+                logger.warning("Could not read beta cache: %s", e)
+        
+        missing = [ticker for ticker in dict.fromkeys(tickers) if ticker not in cached.index]
+        if missing:
+            fresh = pd.Series(self._download_betas(missing, days), index=missing)
+            cached = pd.concat([cached, fresh])
+            try:
+                os.makedirs(self.beta_cache_dir, exist_ok=True)
+                cached.rename('beta').rename_axis('ticker').to_frame().to_parquet(cache_path)
+            except Exception as e:
+                logger.warning("Could not write beta cache: %s", e)
+        
+        return cached.reindex(tickers).to_numpy(dtype=np.float64)
+    
+    def _download_betas(self, tickers: List[str], days: int = 252) -> np.ndarray:
+        """Betas vs. SPY for many stocks from one batched price download
+        
+        Same rules as get_stock_beta (1.0 when history is too short, bounded
+        to 0.1-3.0), but SPY is downloaded once instead of once per stock.
+        """
+        betas = np.ones(len(tickers))
+        if len(tickers) == 0:
+            return betas
+        
+        end_date = datetime.now()
+        start_date = end_date - timedelta(days=days + 50)  # Extra buffer
+        
+        try:
+            prices = yf.download(
+                list(dict.fromkeys(tickers + ['SPY'])),
+                start=start_date,
+                end=end_date,
+                auto_adjust=True,
+                actions=False,
+                group_by='ticker',
+                threads=True,
+                progress=False,
+                session=self.session
+            )
+        except Exception as e:
+            logger.warning("Error downloading prices for betas: %s", e)
+            return betas
+        
+        downloaded = set(prices.columns.get_level_values(0)) if isinstance(prices.columns, pd.MultiIndex) else set()
+        if 'SPY' not in downloaded:
+            return betas
+        
+        # (dates x stocks) closes on the dates SPY traded, stocks that failed
+        # to download stay all-NaN and keep the default beta
+        spy_prices = prices['SPY']['Close'].dropna()
+        if len(spy_prices) < 100:
+            return betas
+        
+        closes = prices.xs('Close', axis=1, level=1).reindex(index=spy_prices.index, columns=tickers)
+        close_array = closes.to_numpy(dtype=np.float64)
+        enough_history = (~np.isnan(close_array)).sum(axis=0) >= 100
+        
+        # Daily returns over the trailing window, a return only counts when
+        # the stock traded on both days
+        window = close_array[-days:]
+        spy_window = spy_prices.to_numpy(dtype=np.float64)[-days:]
+        stock_returns = window[1:] / window[:-1] - 1
+        spy_returns = spy_window[1:] / spy_window[:-1] - 1
+        valid = ~np.isnan(stock_returns)
+        stock_returns = np.where(valid, stock_returns, 0.0)
+        
+        # Sample covariance with SPY and SPY variance for every stock at once,
+        # each restricted to that stock's valid days (a few matrix-vector products)
+        n = valid.sum(axis=0)
+        sum_stock = stock_returns.sum(axis=0)
+        sum_spy = spy_returns @ valid
+        sum_cross = spy_returns @ stock_returns
+        sum_spy_sq = (spy_returns ** 2) @ valid
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            covariance = (sum_cross - sum_stock * sum_spy / n) / (n - 1)
+            spy_variance = (sum_spy_sq - sum_spy ** 2 / n) / (n - 1)
+            raw_betas = covariance / spy_variance
+        
+        # Bound every beta in one vectorized blend, default 1.0 where the
+        # history is too short or the ratio is not finite
+        ok = enough_history & (n >= 50) & (spy_variance > 0) & np.isfinite(raw_betas)
+        return np.where(ok, np.clip(raw_betas, 0.1, 3.0), 1.0)
+    
     def get_market_cap_segment(self, market_cap: float) -> str:
         """Classify stock by market cap segment"""
-        if market_cap >= 50e9:         # $50B+
-            return 'large_cap'
-        elif market_cap >= 5e9:        # $5B-$50B
-            return 'mid_cap'
-        elif market_cap >= 1e9:        # $1B-$5B
-            return 'small_cap'
-        else:                          # <$1B
-            return 'micro_cap'
+        return self.get_market_cap_segments(np.array([market_cap]))[0]
+    
+    def get_market_cap_segments(self, market_caps: np.ndarray) -> np.ndarray:
+        """Classify an array of market caps in one binary search over the thresholds"""
+        return MARKET_CAP_SEGMENTS[np.searchsorted(MARKET_CAP_BINS, market_caps, side='right')]
     
     def enrich_portfolio_data(self, portfolio: pd.DataFrame) -> pd.DataFrame:
         """Add risk factor data to portfolio DataFrame"""
         
         enriched_portfolio = portfolio.copy()
         
-        print(f"🔍 Enriching portfolio data with risk factors...")
+        logger.debug("🔍 Enriching portfolio data with risk factors...")
         
-        # Add columns for risk factors
-        enriched_portfolio['beta'] = 1.0
-        enriched_portfolio['market_cap_segment'] = 'unknown'
+        # Betas for every stock from one batched download (SPY fetched once)
+        enriched_portfolio['beta'] = self.compute_betas_batch(enriched_portfolio['ticker'].tolist())
         
-        for i, row in enriched_portfolio.iterrows():
-            ticker = row['ticker']
-            
-            try:
-                # Get beta
-                beta = self.get_stock_beta(ticker)
-                enriched_portfolio.at[i, 'beta'] = beta
-                
-                # Get market cap segment
-                market_cap = row.get('market_cap', 0)
-                if market_cap > 0:
-                    segment = self.get_market_cap_segment(market_cap)
-                    enriched_portfolio.at[i, 'market_cap_segment'] = segment
-                
-                if i % 10 == 0:
-                    print(f"   Progress: {i}/{len(enriched_portfolio)} stocks processed...")
-                    
-            except Exception as e:
-                print(f"   ⚠️  Error enriching {ticker}: {e}")
-                continue
+        # Get market cap segment - one binning pass over the whole column
+        # ('unknown' when missing)
+        if 'market_cap' in enriched_portfolio.columns:
+            market_caps = enriched_portfolio['market_cap'].fillna(0).to_numpy(dtype=np.float64)
+        else:
+            market_caps = np.zeros(len(enriched_portfolio))
+        enriched_portfolio['market_cap_segment'] = pd.Categorical(np.where(
+            market_caps > 0, self.get_market_cap_segments(market_caps), 'unknown'
+        ))
+        
+        # Compact storage for the constraint scans: float32 betas, categorical labels
+        enriched_portfolio['beta'] = enriched_portfolio['beta'].astype(np.float32)
+        if 'sector' in enriched_portfolio.columns:
+            enriched_portfolio['sector'] = enriched_portfolio['sector'].astype('category')
         
-        print(f"✅ Portfolio enrichment complete")
+        logger.debug("✅ Portfolio enrichment complete")
         return enriched_portfolio
     
     def check_sector_constraints(self, portfolio: pd.DataFrame) -> Tuple[bool, List[str]]:
         """Check if portfolio violates sector concentration limits"""
         
-        violations = []
-        
         if 'sector' not in portfolio.columns:
             return True, ['Missing sector data']
         
         # Calculate sector weights (assuming equal weighting)
-        sector_counts = portfolio['sector'].value_counts()
-        total_positions = len(portfolio)
-        
-        for sector, count in sector_counts.items():
-            weight = count / total_positions
-            limit = self.sector_limits.get(sector, 0.15)  # Default 15% limit
-            
-            if weight > limit:
-                violations.append(f"{sector}: {weight:.1%} > {limit:.1%} limit")
-        
-        return len(violations) == 0, violations
+        return self._sector_violations(_label_weights(portfolio['sector']))
     
     def check_size_constraints(self, portfolio: pd.DataFrame) -> Tuple[bool, List[str]]:
         """Check if portfolio violates market cap segment limits"""
         
-        violations = []
-        
         if 'market_cap_segment' not in portfolio.columns:
             return True, ['Missing market cap segment data']
         
         # Calculate size weights
-        size_counts = portfolio['market_cap_segment'].value_counts()
-        total_positions = len(portfolio)
+        return self._size_violations(_label_weights(portfolio['market_cap_segment']))
+    
+    def check_beta_constraints(self, portfolio: pd.DataFrame) -> Tuple[bool, List[str]]:
+        """Check if portfolio beta is within acceptable range"""
+        
+        if 'beta' not in portfolio.columns:
+            return True, ['Missing beta data']
+        
+        # Calculate portfolio beta (equal weighted)
+        return self._beta_violations(portfolio['beta'].mean())
+    
+    def check_concentration_constraints(self, portfolio: pd.DataFrame) -> Tuple[bool, List[str]]:
+        """Check concentration limits"""
+        
+        return self._concentration_violations(len(portfolio))
+    
+    def _limit_arrays(self) -> Tuple[pd.Index, np.ndarray, pd.Index, np.ndarray]:
+        """Current sector limits and size maxima as arrays indexed by sorted category codes
+        
+        Built from the instance limits on every call (a dozen entries), so
+        overrides always reach the checks and the portfolio builder.
+        """
+        sector_categories = pd.Index(sorted(self.sector_limits), dtype=object)
+        sector_limit_arr = np.array([self.sector_limits[s] for s in sector_categories], dtype=np.float64)
+        size_categories = pd.Index(sorted(self.size_limits), dtype=object)
+        size_max_arr = np.array([self.size_limits[s][1] for s in size_categories], dtype=np.float64)
+        return sector_categories, sector_limit_arr, size_categories, size_max_arr
+    
+    def _sector_violations(self, sector_weights: Dict[str, float]) -> Tuple[bool, List[str]]:
+        """Compare precomputed sector weights against the sector limits"""
+        violations = []
+        
+        sector_categories, sector_limit_arr, _, _ = self._limit_arrays()
+        codes = sector_categories.get_indexer(list(sector_weights))
+        limits = np.append(sector_limit_arr, 0.15)[codes]  # Unlisted (-1) -> default 15% limit
+        
+        for (sector, weight), limit in zip(sector_weights.items(), limits):
+            if weight > limit:
+                violations.append(f"{sector}: {weight:.1%} > {limit:.1%} limit")
+        
+        return len(violations) == 0, violations
+    
+    def _size_violations(self, size_weights: Dict[str, float]) -> Tuple[bool, List[str]]:
+        """Compare precomputed segment weights against the size bands"""
+        violations = []
         
         for segment, (min_weight, max_weight) in self.size_limits.items():
-            count = size_counts.get(segment, 0)
-            weight = count / total_positions
+            weight = size_weights.get(segment, 0.0)
             
             if weight < min_weight:
                 violations.append(f"{segment}: {weight:.1%} < {min_weight:.1%} minimum")
@@ -193,17 +402,9 @@ class RiskConstraintManager:
         
         return len(violations) == 0, violations
     
-    def check_beta_constraints(self, portfolio: pd.DataFrame) -> Tuple[bool, List[str]]:
-        """Check if portfolio beta is within acceptable range"""
-        
+    def _beta_violations(self, portfolio_beta: float) -> Tuple[bool, List[str]]:
+        """Compare a portfolio beta against the beta range"""
         violations = []
-        
-        if 'beta' not in portfolio.columns:
-            return True, ['Missing beta data']
-        
-        # Calculate portfolio beta (equal weighted)
-        portfolio_beta = portfolio['beta'].mean()
-        
         min_beta, max_beta = self.beta_limits
         
         if portfolio_beta < min_beta:
@@ -213,17 +414,16 @@ class RiskConstraintManager:
         
         return len(violations) == 0, violations
     
-    def check_concentration_constraints(self, portfolio: pd.DataFrame) -> Tuple[bool, List[str]]:
-        """Check concentration limits"""
-        
+    def _concentration_violations(self, position_count: int) -> Tuple[bool, List[str]]:
+        """Check position count and equal-weight position size"""
         violations = []
         
         # Check minimum number of positions
-        if len(portfolio) < self.min_position_count:
-            violations.append(f"Only {len(portfolio)} positions < {self.min_position_count} minimum")
+        if position_count < self.min_position_count:
+            violations.append(f"Only {position_count} positions < {self.min_position_count} minimum")
         
         # Check maximum position size (equal weighting assumed)
-        position_weight = 1.0 / len(portfolio) if len(portfolio) > 0 else 1.0
+        position_weight = 1.0 / position_count if position_count > 0 else 1.0
         
         if position_weight > self.max_position_size:
             violations.append(f"Position size {position_weight:.1%} > {self.max_position_size:.1%} maximum")
@@ -234,93 +434,137 @@ class RiskConstraintManager:
                               target_size: int = 50) -> pd.DataFrame:
         """Apply risk constraints to create final portfolio"""
         
-        print(f"🛡️  Applying risk constraints to portfolio...")
-        print(f"   Input: {len(ranked_portfolio)} ranked stocks")
-        print(f"   Target: {target_size} final positions")
+        logger.debug("🛡️  Applying risk constraints to portfolio...")
+        logger.debug("   Input: %d ranked stocks", len(ranked_portfolio))
+        logger.debug("   Target: %d final positions", target_size)
         
         # Enrich with risk factor data
         enriched_portfolio = self.enrich_portfolio_data(ranked_portfolio.head(target_size * 2))  # Use 2x buffer
         
+        # Pull the columns the selection loop needs into parallel arrays once
+        # so each iteration indexes by position instead of boxing a row Series
+        n_candidates = len(enriched_portfolio)
+        tickers = enriched_portfolio['ticker'].to_numpy()
+        if 'sector' in enriched_portfolio.columns:
+            sectors = enriched_portfolio['sector'].to_numpy()
+        else:
+            sectors = np.full(n_candidates, 'Unknown', dtype=object)
+        if 'market_cap_segment' in enriched_portfolio.columns:
+            segments = enriched_portfolio['market_cap_segment'].to_numpy()
+        else:
+            segments = np.full(n_candidates, 'unknown', dtype=object)
+        betas = enriched_portfolio['beta'].to_numpy(np.float64)
+        
+        # Encode sectors and size segments as canonical codes so the selection
+        # loop only does integer lookups into limit and count arrays
+        sector_categories, sector_limit_arr, size_categories, size_max_arr = self._limit_arrays()
+        sector_codes = sector_categories.get_indexer(sectors)
+        unlisted = sector_codes < 0
+        if unlisted.any():
+            # Sectors without an explicit limit get their own slots at the default 15%
+            extra_codes, extra_sectors = pd.factorize(sectors[unlisted], use_na_sentinel=False)
+            sector_codes[unlisted] = len(sector_categories) + extra_codes
+            sector_limit_by_code = np.append(sector_limit_arr, np.full(len(extra_sectors), 0.15))
+        else:
+            sector_limit_by_code = sector_limit_arr
+        
+        # Segments without size limits share a trailing unbounded slot
+        size_codes = size_categories.get_indexer(segments)
+        size_codes[size_codes < 0] = len(size_categories)
+        size_max_by_code = np.append(size_max_arr, np.inf)
+        
         # Start with top-ranked stocks and iteratively build portfolio
-        final_portfolio = []
-        sector_weights = {}
-        size_weights = {}
-        beta_sum = 0.0
-        
-        for i, row in enriched_portfolio.iterrows():
-            if len(final_portfolio) >= target_size:
-                break
-                
-            ticker = row['ticker']
-            sector = row.get('sector', 'Unknown')
-            size_segment = row.get('market_cap_segment', 'unknown')
-            beta = row.get('beta', 1.0)
+        state = PortfolioState(
+            sector_counts=np.zeros(len(sector_limit_by_code), dtype=np.int64),
+            size_counts=np.zeros(len(size_max_by_code), dtype=np.int64),
+        )
+        min_beta, max_beta = self.beta_limits
+        
+        # Once past the flexible first 15, a sector or size segment holding
+        # floor(limit * target_size) stocks can never take another one, so its
+        # remaining candidates are dropped in one vectorized pass
+        sector_caps = np.floor(sector_limit_by_code * target_size + 1e-9)
+        size_caps = np.floor(size_max_by_code * target_size + 1e-9)
+        candidates = np.arange(n_candidates)
+        next_idx = 0
+        
+        while next_idx < len(candidates) and state.n < target_size:
+            pos = candidates[next_idx]
+            next_idx += 1
+            
+            sector_code = sector_codes[pos]
+            size_code = size_codes[pos]
+            beta = betas[pos]
             
             # Calculate weights if we add this stock
-            new_portfolio_size = len(final_portfolio) + 1
-            new_position_weight = 1.0 / new_portfolio_size
+            new_portfolio_size = state.n + 1
             
             # Check sector constraint (only enforce after minimum portfolio size)
-            sector_count = sector_weights.get(sector, 0) + 1
-            new_sector_weight = sector_count / new_portfolio_size
-            sector_limit = self.sector_limits.get(sector, 0.15)
+            new_sector_weight = (state.sector_counts[sector_code] + 1) / new_portfolio_size
+            sector_limit = sector_limit_by_code[sector_code]
             
             # Allow flexibility for first 15 stocks, then enforce constraints
             if new_portfolio_size > 15 and new_sector_weight > sector_limit:
-                print(f"   🚫 Skipping {ticker}: sector {sector} would exceed {sector_limit:.1%} limit")
+                logger.debug("   🚫 Skipping %s: sector %s would exceed %.1f%% limit", tickers[pos], sectors[pos], sector_limit * 100)
                 continue
             
             # Check size constraint (only enforce after minimum portfolio size)
-            size_count = size_weights.get(size_segment, 0) + 1
-            new_size_weight = size_count / new_portfolio_size
+            new_size_weight = (state.size_counts[size_code] + 1) / new_portfolio_size
+            max_size_weight = size_max_by_code[size_code]
             
-            if new_portfolio_size > 15 and size_segment in self.size_limits:
-                _, max_size_weight = self.size_limits[size_segment]
-                if new_size_weight > max_size_weight:
-                    print(f"   🚫 Skipping {ticker}: {size_segment} would exceed {max_size_weight:.1%} limit")
-                    continue
+            if new_portfolio_size > 15 and new_size_weight > max_size_weight:
+                logger.debug("   🚫 Skipping %s: %s would exceed %.1f%% limit", tickers[pos], segments[pos], max_size_weight * 100)
+                continue
             
             # Check beta constraint
-            new_portfolio_beta = (beta_sum + beta) / new_portfolio_size
-            min_beta, max_beta = self.beta_limits
+            new_portfolio_beta = state.mean_beta_with(beta)
             
-            if new_portfolio_beta > max_beta and len(final_portfolio) > 10:  # Allow flexibility initially
-                print(f"   🚫 Skipping {ticker}: portfolio beta would exceed {max_beta:.2f}")
+            if new_portfolio_beta > max_beta and state.n > 10:  # Allow flexibility initially
+                logger.debug("   🚫 Skipping %s: portfolio beta would exceed %.2f", tickers[pos], max_beta)
                 continue
             
             # Add stock to portfolio
-            final_portfolio.append(row)
-            sector_weights[sector] = sector_weights.get(sector, 0) + 1
-            size_weights[size_segment] = size_weights.get(size_segment, 0) + 1
-            beta_sum += beta
+            state.add(pos, sector_code, size_code, beta)
             
-            if len(final_portfolio) % 10 == 0:
-                print(f"   ✅ Added {len(final_portfolio)} stocks to constrained portfolio")
-        
-        # Convert back to DataFrame
-        constrained_portfolio = pd.DataFrame(final_portfolio)
-        
-        # Report final portfolio characteristics
-        print(f"\n📊 Risk-Constrained Portfolio Summary:")
-        print(f"   📈 Portfolio size: {len(constrained_portfolio)} stocks")
-        
-        if len(constrained_portfolio) > 0:
-            portfolio_beta = constrained_portfolio['beta'].mean()
-            print(f"   📊 Portfolio beta: {portfolio_beta:.2f}")
+            if state.n % 10 == 0:
+                logger.debug("   ✅ Added %d stocks to constrained portfolio", state.n)
             
-            # Sector breakdown
-            sector_dist = constrained_portfolio['sector'].value_counts()
-            print(f"   🏢 Sector distribution:")
-            for sector, count in sector_dist.head(5).items():
-                weight = count / len(constrained_portfolio)
-                print(f"      {sector}: {count} stocks ({weight:.1%})")
+            if state.n >= 15:
+                rest = candidates[next_idx:]
+                still_open = (
+                    (state.sector_counts[sector_codes[rest]] < sector_caps[sector_codes[rest]])
+                    & (state.size_counts[size_codes[rest]] < size_caps[size_codes[rest]])
+                )
+                if not still_open.all():
+                    logger.debug("   ✂️  Dropping %d candidates from full sectors/segments", (~still_open).sum())
+                    candidates = np.concatenate([candidates[:next_idx], rest[still_open]])
+        
+        # Materialize the selected rows with one positional slice, keeping dtypes
+        constrained_portfolio = enriched_portfolio.iloc[state.positions].reset_index(drop=True)
+        
+        # Report final portfolio characteristics (skipped entirely unless debugging)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("📊 Risk-Constrained Portfolio Summary:")
+            logger.debug("   📈 Portfolio size: %d stocks", len(constrained_portfolio))
             
-            # Size breakdown
-            size_dist = constrained_portfolio['market_cap_segment'].value_counts()
-            print(f"   📏 Size distribution:")
-            for segment, count in size_dist.items():
-                weight = count / len(constrained_portfolio)
-                print(f"      {segment}: {count} stocks ({weight:.1%})")
+            if len(constrained_portfolio) > 0:
+                logger.debug("   📊 Portfolio beta: %.2f", state.mean_beta)
+                
+                # Sector breakdown
+                sector_dist = constrained_portfolio['sector'].value_counts()
+                sector_dist = sector_dist[sector_dist > 0]  # categories not held
+                logger.debug("   🏢 Sector distribution:")
+                for sector, count in sector_dist.head(5).items():
+                    weight = count / len(constrained_portfolio)
+                    logger.debug("      %s: %d stocks (%.1f%%)", sector, count, weight * 100)
+                
+                # Size breakdown
+                size_dist = constrained_portfolio['market_cap_segment'].value_counts()
+                size_dist = size_dist[size_dist > 0]
+                logger.debug("   📏 Size distribution:")
+                for segment, count in size_dist.items():
+                    weight = count / len(constrained_portfolio)
+                    logger.debug("      %s: %d stocks (%.1f%%)", segment, count, weight * 100)
         
         return constrained_portfolio
     
@@ -342,42 +586,44 @@ class RiskConstraintManager:
             validation_results['violations'].append('Empty portfolio')
             return validation_results
         
-        # Check each constraint type
-        sector_valid, sector_violations = self.check_sector_constraints(portfolio)
-        size_valid, size_violations = self.check_size_constraints(portfolio)
-        beta_valid, beta_violations = self.check_beta_constraints(portfolio)
-        concentration_valid, concentration_violations = self.check_concentration_constraints(portfolio)
+        validation_results.update(self._validate_all(portfolio))
+        return validation_results
+    
+    def _validate_all(self, portfolio: pd.DataFrame) -> Dict[str, any]:
+        """Run every constraint check off one set of weights and beta computed per portfolio"""
         
-        # Update results
-        validation_results['sector_valid'] = sector_valid
-        validation_results['size_valid'] = size_valid
-        validation_results['beta_valid'] = beta_valid
-        validation_results['concentration_valid'] = concentration_valid
+        results = {'violations': []}
         
-        validation_results['violations'].extend(sector_violations)
-        validation_results['violations'].extend(size_violations)
-        validation_results['violations'].extend(beta_violations)
-        validation_results['violations'].extend(concentration_violations)
+        # Portfolio characteristics are computed once and shared by the checks
+        if 'sector' in portfolio.columns:
+            results['sector_weights'] = _label_weights(portfolio['sector'])
+            sector_valid, sector_violations = self._sector_violations(results['sector_weights'])
+        else:
+            sector_valid, sector_violations = True, ['Missing sector data']
+        
+        if 'market_cap_segment' in portfolio.columns:
+            results['size_weights'] = _label_weights(portfolio['market_cap_segment'])
+            size_valid, size_violations = self._size_violations(results['size_weights'])
+        else:
+            size_valid, size_violations = True, ['Missing market cap segment data']
         
-        # Calculate portfolio characteristics
         if 'beta' in portfolio.columns:
-            validation_results['portfolio_beta'] = portfolio['beta'].mean()
+            results['portfolio_beta'] = portfolio['beta'].mean()
+            beta_valid, beta_violations = self._beta_violations(results['portfolio_beta'])
+        else:
+            beta_valid, beta_violations = True, ['Missing beta data']
         
-        if 'sector' in portfolio.columns:
-            sector_counts = portfolio['sector'].value_counts()
-            total = len(portfolio)
-            validation_results['sector_weights'] = {
-                sector: count / total for sector, count in sector_counts.items()
-            }
+        concentration_valid, concentration_violations = self._concentration_violations(len(portfolio))
         
-        if 'market_cap_segment' in portfolio.columns:
-            size_counts = portfolio['market_cap_segment'].value_counts()
-            total = len(portfolio)
-            validation_results['size_weights'] = {
-                segment: count / total for segment, count in size_counts.items()
-            }
+        results['sector_valid'] = sector_valid
+        results['size_valid'] = size_valid
+        results['beta_valid'] = beta_valid
+        results['concentration_valid'] = concentration_valid
+        results['violations'] = (
+            sector_violations + size_violations + beta_violations + concentration_violations
+        )
         
-        return validation_results
+        return results
 
 
 def test_risk_constraints():
@@ -388,7 +634,12 @@ def test_risk_constraints():
     
     # Load sample portfolio data
     try:
-        sample_data = pd.read_csv('data/russell_1000_proxy_20250724.csv')
+        sample_data = pd.read_csv(
+            'data/russell_1000_proxy_20250724.csv',
+            engine='pyarrow',
+            usecols=['ticker', 'company_name', 'market_cap', 'sector'],
+            dtype_backend='pyarrow'
+        )
         print(f"📊 Loaded {len(sample_data)} stocks from Russell proxy")
         
         # Create sample ranked portfolio (top 100 by mock ranking)
@@ -426,4 +677,6 @@ def test_risk_constraints():
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    logger.setLevel(logging.DEBUG)
     test_risk_constraints()
\ No newline at end of file
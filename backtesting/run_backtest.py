@@ -5,17 +5,24 @@ This demonstrates how to use the backtesting framework with our current
 Modern Magic Formula screening data.
 """
 
+import argparse
+import logging
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from backtesting.engine import BacktestEngine, BacktestConfig, load_current_screening_data
 from backtesting.metrics import create_performance_summary, format_metrics_for_display
+import numpy as np
 import pandas as pd
 
 
-def run_simple_backtest():
-    """Run a simple backtest example."""
+def run_simple_backtest(export_csv: bool = False):
+    """Run a simple backtest example.
+    
+    Args:
+        export_csv: Also write the daily results as CSV for tools that can't read Parquet
+    """
     
     print("🚀 Modern Magic Formula Backtest")
     print("="*50)
@@ -93,17 +100,25 @@ def run_simple_backtest():
             print(f"      ... and {len(summary['portfolio_history']) - 3} more rebalances")
         
         # Save results
+        # float32 is ample precision for stored daily returns
         results_df = pd.DataFrame({
             'date': results['portfolio_returns'].index,
-            'portfolio_return': results['portfolio_returns'].values
+            'portfolio_return': results['portfolio_returns'].to_numpy(dtype=np.float32)
         })
         
-        if results['benchmark_returns'] is not None:
-            benchmark_aligned = results['benchmark_returns'].reindex(results['portfolio_returns'].index, method='ffill')
-            results_df['benchmark_return'] = benchmark_aligned.values
+        benchmark_returns = results['benchmark_returns']
+        if benchmark_returns is not None and len(benchmark_returns) > 0:
+            # Forward-fill the benchmark onto portfolio dates with one pad indexer
+            pos = benchmark_returns.index.get_indexer(results['portfolio_returns'].index, method='pad')
+            benchmark_aligned = np.where(pos >= 0, benchmark_returns.to_numpy(dtype=np.float64)[pos.clip(0)], np.nan)
+            results_df['benchmark_return'] = benchmark_aligned.astype(np.float32)
+        
+        results_df.to_parquet('backtesting/backtest_results.parquet', engine='pyarrow', compression='zstd', index=False)
+        print(f"\n💾 Results saved to backtesting/backtest_results.parquet")
         
-        results_df.to_csv('backtesting/backtest_results.csv', index=False)
-        print(f"\n💾 Results saved to backtesting/backtest_results.csv")
+        if export_csv:
+            results_df.to_csv('backtesting/backtest_results.csv', index=False, float_format='%.6g')
+            print(f"💾 CSV copy saved to backtesting/backtest_results.csv")
         
         return results
         
@@ -115,4 +130,10 @@ def run_simple_backtest():
 
 
 if __name__ == "__main__":
-    run_simple_backtest()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Run the Modern Magic Formula backtest on current screening data.")
+    parser.add_argument("--csv", action="store_true", help="Also export results as backtesting/backtest_results.csv.")
+    args = parser.parse_args()
+    
+    # Show the engine's per-rebalance progress on the console
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    run_simple_backtest(export_csv=args.csv)
\ No newline at end of file
@@ -10,24 +10,38 @@ This script runs a comprehensive 20+ year backtest with enhanced features:
 5. Detailed performance attribution
 """
 
+import argparse
+import json
+import logging
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from backtesting.engine import BacktestEngine, BacktestConfig, load_current_screening_data
+from backtesting.engine import BacktestEngine, BacktestConfig, BACKTEST_COLUMNS, load_current_screening_data
 from backtesting.metrics import create_performance_summary, format_metrics_for_display
 from backtesting.risk_constraints import RiskConstraintManager
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 import pandas as pd
+from datetime import datetime
+from typing import Optional
 
+logger = logging.getLogger(__name__)
 
-def run_extended_backtest():
-    """Run comprehensive extended backtest from 2000-2024"""
+
+def run_extended_backtest(export_csv: bool = False, refresh_prices: bool = False):
+    """Run comprehensive extended backtest from 2000-2024
+    
+    Args:
+        export_csv: Also write the daily results as CSV for tools that can't read Parquet
+        refresh_prices: Re-download prices even when a cached copy exists
+    """
     
     print("🚀 Modern Magic Formula Extended Backtest (2000-2024)")
     print("="*70)
     
-    # Load universe data
-    screening_data = load_current_screening_data()
+    # Load universe data (only the columns the backtest uses)
+    screening_data = load_current_screening_data(columns=BACKTEST_COLUMNS)
     if screening_data.empty:
         print("❌ No screening data available. Please run ETL first.")
         return
@@ -41,7 +55,8 @@ def run_extended_backtest():
         initial_capital=1000000.0,  # $1M for institutional-scale analysis
         transaction_cost=0.001,     # Will be overridden by realistic costs
         benchmark="SPY",
-        min_market_cap=2e9          # $2B minimum for longer data history
+        min_market_cap=2e9,         # $2B minimum for longer data history
+        refresh_price_cache=refresh_prices
     )
     
     print(f"📊 Extended Backtest Configuration:")
@@ -97,22 +112,29 @@ def run_extended_backtest():
         summary = create_performance_summary(results)
         
         # Display comprehensive results
-        print_extended_results(summary, config)
+        print_extended_results(summary, config, results)
         
         # Save detailed results
-        save_extended_results(results, summary)
+        save_extended_results(results, summary, export_csv=export_csv)
         
         return results
         
     except Exception as e:
-        print(f"\n❌ Extended backtest failed: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("❌ Extended backtest failed: %s", e)
         return None
 
 
-def print_extended_results(summary: dict, config: BacktestConfig):
-    """Print comprehensive backtest results"""
+def print_extended_results(summary: dict, config: BacktestConfig, results: Optional[dict] = None):
+    """Print comprehensive backtest results
+    
+    Args:
+        summary: Output of create_performance_summary
+        config: Configuration the backtest ran with
+        results: Raw BacktestEngine.run_backtest() output; the daily return
+            series and transaction costs come from here, since the summary
+            does not carry them
+    """
+    results = results if results is not None else summary
     
     print(f"\n📈 EXTENDED BACKTEST RESULTS (24 Years)")
     print("="*70)
@@ -124,8 +146,8 @@ def print_extended_results(summary: dict, config: BacktestConfig):
     
     # Market cycle analysis
     print(f"\n📈 Market Cycle Performance:")
-    portfolio_returns = summary.get('portfolio_returns', pd.Series())
-    benchmark_returns = summary.get('benchmark_returns', pd.Series())
+    portfolio_returns = results.get('portfolio_returns', pd.Series())
+    benchmark_returns = results.get('benchmark_returns', pd.Series())
     
     if len(portfolio_returns) > 0:
         # Analyze major market periods
@@ -137,36 +159,67 @@ def print_extended_results(summary: dict, config: BacktestConfig):
             'COVID Era (2020-2024)': ('2020-01-01', '2024-01-01')
         }
         
-        for period_name, (start, end) in market_periods.items():
-            try:
-                period_portfolio = portfolio_returns[start:end]
-                period_benchmark = benchmark_returns[start:end] if len(benchmark_returns) > 0 else None
+        # Cumulative log returns are built once; each period's compounded
+        # return is then a difference of two entries (missing returns count
+        # as flat, like pandas' skipna prod)
+        dates = portfolio_returns.index.values.astype('datetime64[ns]')
+        portfolio_array = portfolio_returns.to_numpy(dtype=np.float64)
+        cum_portfolio = np.concatenate([[0.0], np.nan_to_num(np.log1p(portfolio_array)).cumsum()])
+        
+        # Row bounds of every period from one searchsorted per side
+        period_starts = np.array([start for start, _ in market_periods.values()], dtype='datetime64[ns]')
+        period_ends = np.array([end for _, end in market_periods.values()], dtype='datetime64[ns]')
+        starts = np.searchsorted(dates, period_starts)
+        ends = np.searchsorted(dates, period_ends, side='right')
+        
+        has_benchmark = benchmark_returns is not None and len(benchmark_returns) > 0
+        if has_benchmark:
+            benchmark_dates = benchmark_returns.index.values.astype('datetime64[ns]')
+            benchmark_array = benchmark_returns.to_numpy(dtype=np.float64)
+            cum_benchmark = np.concatenate([[0.0], np.nan_to_num(np.log1p(benchmark_array)).cumsum()])
+            benchmark_starts = np.searchsorted(benchmark_dates, period_starts)
+            benchmark_ends = np.searchsorted(benchmark_dates, period_ends, side='right')
+        
+        # Rolling quarterly volatility over the whole history in one strided
+        # pass; rolling_vol[s] covers rows s..s+62, and a window with a
+        # missing return stays NaN
+        window = 63
+        rolling_vol = None
+        if len(portfolio_array) >= window:
+            rolling_vol = sliding_window_view(portfolio_array, window).std(axis=-1, ddof=1) * np.sqrt(252)
+        
+        for k, period_name in enumerate(market_periods):
+            i, j = starts[k], ends[k]
+            
+            if j > i:
+                period_return = np.expm1(cum_portfolio[j] - cum_portfolio[i])
+                period_vol = np.nanstd(portfolio_array[i:j], ddof=1) * np.sqrt(252)
                 
-                if len(period_portfolio) > 0:
-                    period_return = (1 + period_portfolio).prod() - 1
-                    period_vol = period_portfolio.std() * np.sqrt(252)
-                    
-                    benchmark_return = (1 + period_benchmark).prod() - 1 if period_benchmark is not None and len(period_benchmark) > 0 else 0
-                    alpha = period_return - benchmark_return
-                    
-                    print(f"   {period_name}:")
-                    print(f"      Portfolio: {period_return*100:+.1f}% | Benchmark: {benchmark_return*100:+.1f}% | Alpha: {alpha*100:+.1f}%")
-                    
-            except Exception as e:
-                print(f"   {period_name}: Analysis failed ({e})")
-    
-    # Risk and drawdown analysis
-    print(f"\n🛡️  Risk Analysis:")
-    if 'Max Drawdown' in summary['metrics']:
-        max_dd = summary['metrics']['Max Drawdown']
-        print(f"   📉 Maximum drawdown: {max_dd}")
+                benchmark_return = 0
+                if has_benchmark and benchmark_ends[k] > benchmark_starts[k]:
+                    benchmark_return = np.expm1(cum_benchmark[benchmark_ends[k]] - cum_benchmark[benchmark_starts[k]])
+                alpha = period_return - benchmark_return
+                
+                print(f"   {period_name}:")
+                print(f"      Portfolio: {period_return*100:+.1f}% | Benchmark: {benchmark_return*100:+.1f}% | Alpha: {alpha*100:+.1f}%")
+                
+                # Windows lying entirely inside the period
+                period_windows = rolling_vol[i:j - window + 1] if rolling_vol is not None and j - i >= window else None
+                if period_windows is not None and not np.isnan(period_windows).all():
+                    print(f"      Volatility: {period_vol*100:.1f}% | Rolling quarterly: {np.nanmin(period_windows)*100:.1f}% - {np.nanmax(period_windows)*100:.1f}%")
+                else:
+                    print(f"      Volatility: {period_vol*100:.1f}%")
     
-    if 'Sharpe Ratio' in summary['metrics']:
-        sharpe = summary['metrics']['Sharpe Ratio']
-        print(f"   📊 Sharpe ratio: {sharpe}")
+    # Risk and drawdown analysis, read from the display table built above
+    print(f"\n🛡️  Risk Analysis:")
+    display_values = dict(zip(metrics_df['Metric'], metrics_df['Value']))
+    for icon, label, metric in (('📉', 'Maximum drawdown', 'Max Drawdown'), ('📊', 'Sharpe ratio', 'Sharpe Ratio')):
+        value = display_values.get(metric)
+        if value is not None:
+            print(f"   {icon} {label}: {value}")
     
     # Transaction cost impact
-    total_costs = summary.get('transaction_costs', 0)
+    total_costs = results.get('transaction_costs', 0)
     print(f"\n💰 Transaction Cost Analysis:")
     print(f"   📊 Total transaction costs: {total_costs*100:.2f}%")
     print(f"   📅 Cost per year: {(total_costs/24)*100:.2f}%")
@@ -177,24 +230,66 @@ def print_extended_results(summary: dict, config: BacktestConfig):
     if portfolio_history:
         print(f"\n📊 Portfolio Evolution:")
         print(f"   🔄 Total rebalances: {len(portfolio_history)}")
-        print(f"   📈 Average portfolio size: {np.mean([len(p['portfolio']) for p in portfolio_history]):.1f} stocks")
+        sizes = np.fromiter(
+            (len(p['portfolio']) for p in portfolio_history), dtype=np.int32, count=len(portfolio_history)
+        )
+        print(f"   📈 Average portfolio size: {sizes.mean():.1f} stocks")
         
-        # Sector analysis across time
-        all_sectors = []
-        for period in portfolio_history:
-            if 'sector' in period['portfolio'].columns:
-                all_sectors.extend(period['portfolio']['sector'].tolist())
+        # Sector analysis across time: one concat, integer codes in order of
+        # first appearance, one bincount
+        sector_columns = [p['portfolio']['sector'] for p in portfolio_history if 'sector' in p['portfolio'].columns]
+        sector_codes, sectors = pd.factorize(pd.concat(sector_columns, ignore_index=True, copy=False)) if sector_columns else ([], [])
         
-        if all_sectors:
-            sector_freq = pd.Series(all_sectors).value_counts()
+        if len(sector_codes) > 0:
+            counts = np.bincount(sector_codes[sector_codes >= 0], minlength=len(sectors))
             print(f"   🏢 Most frequent sectors:")
-            for sector, count in sector_freq.head(3).items():
-                pct = count / len(portfolio_history) * 100
-                print(f"      {sector}: {pct:.1f}% of rebalances")
+            for code in np.argsort(-counts, kind='stable')[:3]:
+                pct = counts[code] / len(portfolio_history) * 100
+                print(f"      {sectors[code]}: {pct:.1f}% of rebalances")
+
+
+def _cumulative_growth(returns: np.ndarray) -> np.ndarray:
+    """Growth of $1 via np.cumprod, skipping missing returns like pandas cumprod"""
+    growth = np.cumprod(1.0 + np.nan_to_num(returns))
+    growth[np.isnan(returns)] = np.nan
+    return growth
 
 
-def save_extended_results(results: dict, summary: dict):
-    """Save comprehensive results to files"""
+def _holdings_frame(portfolio_history: list) -> pd.DataFrame:
+    """Stack the per-rebalance holdings into one table keyed by rebalance date"""
+    if not portfolio_history:
+        return pd.DataFrame()
+    return pd.concat(
+        [period['portfolio'].assign(rebalance_date=period['date']) for period in portfolio_history],
+        ignore_index=True
+    )
+
+
+def _summary_payload(value, name: str, summary_filename: str):
+    """JSON-ready summary value; tables are written to sibling Parquet files and replaced by the filename"""
+    if name == 'portfolio_history':
+        value = _holdings_frame(value)
+    if isinstance(value, (pd.Series, pd.DataFrame)):
+        table_filename = summary_filename.replace('summary', name).replace('.json', '.parquet')
+        table = value.to_frame() if isinstance(value, pd.Series) else value
+        table.to_parquet(table_filename, engine='pyarrow', compression='zstd')
+        return table_filename
+    if isinstance(value, dict):
+        return {key: _summary_payload(item, f"{name}_{key}", summary_filename) for key, item in value.items()}
+    return value
+
+
+def _json_default(value):
+    """JSON fallback for numpy scalars and timestamps in the summary"""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (pd.Timestamp, datetime)):
+        return value.isoformat()
+    return str(value)
+
+
+def save_extended_results(results: dict, summary: dict, export_csv: bool = False):
+    """Save comprehensive results to files (Parquet, plus CSV when export_csv)"""
     
     print(f"\n💾 Saving Extended Backtest Results...")
     
@@ -203,43 +298,61 @@ def save_extended_results(results: dict, summary: dict):
     benchmark_returns = results.get('benchmark_returns', pd.Series())
     
     if len(portfolio_returns) > 0:
-        results_df = pd.DataFrame({
-            'date': portfolio_returns.index,
-            'portfolio_return': portfolio_returns.values
-        })
+        # One date stamp for every artifact of this run
+        stamp = pd.Timestamp.now().strftime('%Y%m%d')
+        portfolio_array = portfolio_returns.to_numpy(dtype=np.float64)
+        benchmark_array = None
+        
+        if benchmark_returns is not None and len(benchmark_returns) > 0:
+            # Forward-fill the benchmark onto portfolio dates with one pad indexer
+            pos = benchmark_returns.index.get_indexer(portfolio_returns.index, method='pad')
+            benchmark_array = np.where(
+                pos >= 0, benchmark_returns.to_numpy(dtype=np.float64)[pos.clip(0)], np.nan
+            )
         
-        if len(benchmark_returns) > 0:
-            benchmark_aligned = benchmark_returns.reindex(portfolio_returns.index, method='ffill')
-            results_df['benchmark_return'] = benchmark_aligned.values
+        # Growth is compounded in float64; the stored series only need float32,
+        # which halves the artifacts. Every column is ready before the frame is
+        # built, so it is constructed once with no later insertions or casts
+        columns = {
+            'date': portfolio_returns.index,
+            'portfolio_return': portfolio_array.astype(np.float32),
+        }
+        if benchmark_array is not None:
+            columns['benchmark_return'] = benchmark_array.astype(np.float32)
+        columns['portfolio_cumulative'] = _cumulative_growth(portfolio_array).astype(np.float32)
+        if benchmark_array is not None:
+            columns['benchmark_cumulative'] = _cumulative_growth(benchmark_array).astype(np.float32)
         
-        # Calculate cumulative returns
-        results_df['portfolio_cumulative'] = (1 + results_df['portfolio_return']).cumprod()
-        if 'benchmark_return' in results_df.columns:
-            results_df['benchmark_cumulative'] = (1 + results_df['benchmark_return']).cumprod()
+        results_df = pd.DataFrame(columns)
         
-        # Save to CSV
-        filename = f"backtesting/extended_backtest_results_{pd.Timestamp.now().strftime('%Y%m%d')}.csv"
-        results_df.to_csv(filename, index=False)
+        # Parquet is the canonical, typed artifact; CSV is an opt-in legacy export
+        filename = f"backtesting/extended_backtest_results_{stamp}.parquet"
+        results_df.to_parquet(filename, engine='pyarrow', compression='zstd', index=False)
         print(f"   📊 Results saved to: {filename}")
         
+        if export_csv:
+            csv_filename = filename[:-len('.parquet')] + '.csv'
+            results_df.to_csv(csv_filename, index=False, float_format='%.6g')
+            print(f"   📊 CSV copy saved to: {csv_filename}")
+        
         # Save summary statistics
-        summary_filename = f"backtesting/extended_backtest_summary_{pd.Timestamp.now().strftime('%Y%m%d')}.json"
-        import json
-        
-        # Convert non-serializable objects to strings
-        serializable_summary = {}
-        for key, value in summary.items():
-            if isinstance(value, (pd.Series, pd.DataFrame)):
-                serializable_summary[key] = str(value)
-            elif key == 'metrics':
-                serializable_summary[key] = {k: str(v) for k, v in value.items()}
-            else:
-                serializable_summary[key] = str(value)
+        summary_filename = f"backtesting/extended_backtest_summary_{stamp}.json"
+        
+        # Tables go to sibling Parquet files referenced by name, everything
+        # else (metrics stay numeric) is written as plain JSON
+        payload = {key: _summary_payload(value, key, summary_filename) for key, value in summary.items()}
         
         with open(summary_filename, 'w') as f:
-            json.dump(serializable_summary, f, indent=2)
+            json.dump(payload, f, indent=2, default=_json_default)
         print(f"   📋 Summary saved to: {summary_filename}")
 
 
 if __name__ == "__main__":
-    run_extended_backtest()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Run the 2000-2024 extended Modern Magic Formula backtest.")
+    parser.add_argument("--csv", action="store_true", help="Also export the daily results as CSV next to the Parquet file.")
+    parser.add_argument("--refresh", action="store_true", help="Re-download prices instead of reusing the cached copy from an earlier run.")
+    args = parser.parse_args()
+    
+    # Show the engine's per-rebalance progress on the console
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    run_extended_backtest(export_csv=args.csv, refresh_prices=args.refresh)
\ No newline at end of file
@@ -5,17 +5,33 @@ Comprehensive interaction and analysis to diagnose deployment issues
 """
 
 from playwright.sync_api import sync_playwright
+import gzip
 import os
 import time
 
-def check_streamlit_app():
-    """Check the Streamlit app with comprehensive analysis"""
+# Collects everything the report needs from the DOM in a single evaluate call
+PAGE_SNAPSHOT_JS = """([selectors, navSelector]) => {
+    const nav = Array.from(document.querySelectorAll(navSelector));
+    return {
+        title: document.title,
+        bodyText: document.body ? document.body.textContent : "",
+        counts: Object.fromEntries(selectors.map(([name, sel]) => [name, document.querySelectorAll(sel).length])),
+        navCount: nav.length,
+        navTexts: nav.slice(0, 5).map((el) => el.textContent),
+    };
+}"""
+
+def check_streamlit_app(headless: bool = True):
+    """Check the Streamlit app with comprehensive analysis
+    
+    Args:
+        headless: Run Chromium without a window (pass False to watch the run)
+    """
     
     print("🌐 Launching Playwright for Streamlit app analysis...")
     
     with sync_playwright() as p:
-        # Launch browser with extended timeout
-        browser = p.chromium.launch(headless=False, slow_mo=1000)  # Visible browser for debugging
+        browser = p.chromium.launch(headless=headless)
         
         try:
             # Create new page with extended timeout
@@ -27,60 +43,40 @@ def check_streamlit_app():
             
             print("📱 Navigating to Streamlit app...")
             
-            # Navigate to Streamlit app with extended wait
-            response = page.goto("https://modernmagicformula.streamlit.app", wait_until="domcontentloaded")
+            # Navigate and let the initial burst of requests settle
+            response = page.goto("https://modernmagicformula.streamlit.app", wait_until="networkidle")
             
             if response:
                 print(f"📊 Response status: {response.status}")
                 print(f"🔗 Final URL: {page.url}")
             
-            # Wait for Streamlit to initialize
+            # Wait for Streamlit to render its main content area instead of sleeping
             print("⏳ Waiting for Streamlit to load...")
-            page.wait_for_timeout(10000)  # 10 seconds for Streamlit to load
+            try:
+                main_content = page.wait_for_selector(".main .block-container", state="visible")
+                print("✅ Streamlit main content area found")
+            except:
+                print("❌ Streamlit main content area not found")
             
             # Take initial screenshot
             print("📸 Taking initial screenshot...")
-            page.screenshot(path="streamlit_initial.png", full_page=True)
+            page.screenshot(path="streamlit_initial.jpg", full_page=True, type="jpeg", quality=70)
             
-            # Look for Streamlit-specific loading indicators
+            # Dynamic content is done once no Streamlit spinner is left on the page
+            print("⏳ Waiting for dynamic content to load...")
             try:
-                # Wait for Streamlit spinner to disappear (if present)
-                page.wait_for_selector(".stSpinner", state="detached", timeout=15000)
+                page.wait_for_function("() => !document.querySelector('.stSpinner')", timeout=20000)
                 print("✅ Streamlit spinner finished")
             except:
-                print("ℹ️ No Streamlit spinner detected")
-            
-            # Check for Streamlit main content area
-            try:
-                main_content = page.wait_for_selector(".main .block-container", timeout=10000)
-                print("✅ Streamlit main content area found")
-            except:
-                print("❌ Streamlit main content area not found")
-            
-            # Wait additional time for dynamic content
-            print("⏳ Waiting for dynamic content to load...")
-            page.wait_for_timeout(5000)
+                print("ℹ️ Streamlit spinner still visible after 20s")
             
             # Take final screenshot after loading
             print("📸 Taking final screenshot after loading...")
-            page.screenshot(path="streamlit_loaded.png", full_page=True)
+            page.screenshot(path="streamlit_loaded.jpg", full_page=True, type="jpeg", quality=70)
             
             # Get page content
             page_content = page.content()
             
-            # Get visible text content
-            try:
-                body_text = page.locator("body").text_content()
-                visible_text_length = len(body_text.strip())
-            except:
-                body_text = ""
-                visible_text_length = 0
-            
-            print(f"\n📊 Detailed Page Analysis:")
-            print(f"   - HTML content length: {len(page_content)} characters")
-            print(f"   - Visible text length: {visible_text_length} characters")
-            print(f"   - Page title: {page.title()}")
-            
             # Check for specific Streamlit elements
             streamlit_elements = {
                 "Streamlit container": ".main .block-container",
@@ -91,17 +87,30 @@ def check_streamlit_app():
                 "Streamlit dataframe": ".stDataFrame"
             }
             
+            # Title, visible text, element counts and navigation labels in one
+            # browser round-trip instead of a locator call per query
+            try:
+                snapshot = page.evaluate(PAGE_SNAPSHOT_JS, [list(streamlit_elements.items()), "a, button"])
+            except:
+                snapshot = {"title": "", "bodyText": "", "counts": {}, "navCount": 0, "navTexts": []}
+            body_text = snapshot["bodyText"] or ""
+            visible_text_length = len(body_text.strip())
+            page_title = snapshot["title"]
+            
+            print(f"\n📊 Detailed Page Analysis:")
+            print(f"   - HTML content length: {len(page_content)} characters")
+            print(f"   - Visible text length: {visible_text_length} characters")
+            print(f"   - Page title: {page_title}")
+            
             print("\n🔍 Streamlit Element Detection:")
-            for name, selector in streamlit_elements.items():
-                try:
-                    elements = page.locator(selector)
-                    count = elements.count()
-                    if count > 0:
-                        print(f"   ✅ {name}: {count} found")
-                    else:
-                        print(f"   ❌ {name}: not found")
-                except:
+            for name in streamlit_elements:
+                count = snapshot["counts"].get(name)
+                if count is None:
                     print(f"   ❌ {name}: error checking")
+                elif count > 0:
+                    print(f"   ✅ {name}: {count} found")
+                else:
+                    print(f"   ❌ {name}: not found")
             
             # Check for app-specific content
             print("\n🎯 App Content Analysis:")
@@ -121,16 +130,11 @@ def check_streamlit_app():
             
             # Look for navigation elements
             print("\n🧭 Navigation Analysis:")
-            nav_elements = page.locator("a, button").all()
-            if nav_elements:
-                print(f"   - Found {len(nav_elements)} interactive elements")
-                for i, element in enumerate(nav_elements[:5]):  # First 5 elements
-                    try:
-                        text = element.text_content()
-                        if text and text.strip():
-                            print(f"     • {text.strip()}")
-                    except:
-                        pass
+            if snapshot["navCount"]:
+                print(f"   - Found {snapshot['navCount']} interactive elements")
+                for text in snapshot["navTexts"]:  # First 5 elements
+                    if text and text.strip():
+                        print(f"     • {text.strip()}")
             
             # Check for specific old vs new interface indicators
             print("\n🔄 Version Detection:")
@@ -147,34 +151,41 @@ def check_streamlit_app():
             else:
                 print("   ❓ Unable to determine interface version")
             
-            # Save detailed analysis
-            with open("streamlit_analysis.txt", "w") as f:
-                f.write(f"Streamlit App Analysis Report\n")
-                f.write(f"Generated: {time.strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-                f.write(f"URL: {page.url}\n")
-                f.write(f"Response Status: {response.status if response else 'Unknown'}\n")
-                f.write(f"Page Title: {page.title()}\n")
-                f.write(f"HTML Length: {len(page_content)}\n")
-                f.write(f"Visible Text Length: {visible_text_length}\n\n")
-                f.write("Visible Text Content:\n")
-                f.write("=" * 50 + "\n")
-                f.write(body_text)
-                
-            with open("streamlit_html.html", "w") as f:
+            # Save detailed analysis: the report is joined once and swapped in
+            # atomically, the raw HTML is written gzip-compressed
+            report = "\n".join([
+                "Streamlit App Analysis Report",
+                f"Generated: {time.strftime('%Y-%m-%d %H:%M:%S')}",
+                "",
+                f"URL: {page.url}",
+                f"Response Status: {response.status if response else 'Unknown'}",
+                f"Page Title: {page_title}",
+                f"HTML Length: {len(page_content)}",
+                f"Visible Text Length: {visible_text_length}",
+                "",
+                "Visible Text Content:",
+                "=" * 50,
+                body_text,
+            ])
+            with open("streamlit_analysis.txt.tmp", "w") as f:
+                f.write(report)
+            os.replace("streamlit_analysis.txt.tmp", "streamlit_analysis.txt")
+            
+            with gzip.open("streamlit_html.html.gz", "wt", compresslevel=3) as f:
                 f.write(page_content)
                 
             print(f"\n📄 Analysis saved to:")
             print(f"   - streamlit_analysis.txt (readable report)")
-            print(f"   - streamlit_html.html (full HTML)")
-            print(f"   - streamlit_initial.png (initial state)")
-            print(f"   - streamlit_loaded.png (final state)")
+            print(f"   - streamlit_html.html.gz (full HTML, gzip)")
+            print(f"   - streamlit_initial.jpg (initial state)")
+            print(f"   - streamlit_loaded.jpg (final state)")
             
         except Exception as e:
             print(f"❌ Error during Streamlit analysis: {e}")
             # Take error screenshot
             try:
-                page.screenshot(path="streamlit_error.png", full_page=True)
-                print("📸 Error screenshot saved to: streamlit_error.png")
+                page.screenshot(path="streamlit_error.jpg", full_page=True, type="jpeg", quality=70)
+                print("📸 Error screenshot saved to: streamlit_error.jpg")
             except:
                 pass
             
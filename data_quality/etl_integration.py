@@ -32,17 +32,30 @@ def integrate_with_pipeline(
     *,
     output_dir: Optional[Path] = None,
 ) -> pd.DataFrame:
-    """Example helper that validates and persists an ETL result."""
+    """Example helper that validates and persists an ETL result.
+
+    The dataframe is validated once, in memory, before anything is written;
+    the exports are the same data, so they are not read back and checked
+    again. A typed Parquet copy is written next to the CSV for readers that
+    can load it column by column. A frame that already passed
+    :func:`ensure_dataframe_quality` unchanged is a cache hit in the
+    validator, so the step boundary costs one fingerprint, not a full check.
+    """
 
     validate_screening_dataframe(curated_df)
 
     output_dir = Path(output_dir) if output_dir else Path("data")
     output_dir.mkdir(parents=True, exist_ok=True)
 
+    # Categorical sector is stored dictionary-encoded, as in the app's Parquet
+    parquet_path = output_dir / "latest_screening.parquet"
+    curated_df.astype({"sector": "category"}).to_parquet(
+        parquet_path, engine="pyarrow", index=False
+    )
+
     csv_path = output_dir / "latest_screening.csv"
     curated_df.to_csv(csv_path, index=False)
 
-    run_post_etl_quality_check(csv_path)
     return curated_df
 
 
@@ -54,7 +54,7 @@ def demo_diy_experience():
         sector_stocks = diy_filtered[diy_filtered['sector'] == sector].head(max_per_sector)
         balanced_picks.append(sector_stocks)
     
-    final_picks = pd.concat(balanced_picks).sort_values('magic_formula_rank').head(20)
+    final_picks = pd.concat(balanced_picks).nsmallest(20, 'magic_formula_rank')
     
     print(f"\n📈 YOUR MAGIC FORMULA STOCK PICKS:")
     print(f"   🎯 {len(final_picks)} high-quality value stocks")
@@ -40,6 +40,10 @@ class HybridFundamentals:
             'Host': 'data.sec.gov'
         }
         self.rate_limit_delay = 0.1  # SEC allows 10 requests per second
+        # One pooled session so the ~1000 per-ticker SEC calls reuse TCP/TLS connections
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=4)
+        self.session.mount('https://', adapter)
         self.ticker_to_cik_cache = {}
         self.offline_mode = False
         self.consecutive_failures = 0
@@ -112,7 +116,7 @@ class HybridFundamentals:
                 'User-Agent': 'Modern Magic Formula Research contact@example.com',
                 'Accept': 'application/json'
             }
-            response = requests.get(url, headers=headers, timeout=30)
+            response = self.session.get(url, headers=headers, timeout=30)
             
             if response.status_code == 200:
                 data = response.json()
@@ -165,7 +169,7 @@ class HybridFundamentals:
         try:
             time.sleep(self.rate_limit_delay)
             url = f"https://data.sec.gov/api/xbrl/companyfacts/CIK{cik}.json"
-            response = requests.get(url, headers=self.headers, timeout=30)
+            response = self.session.get(url, headers=self.headers, timeout=30)
 
             if response.status_code == 200:
                 company_facts = response.json()
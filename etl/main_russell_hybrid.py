@@ -278,6 +278,11 @@ def run_russell_1000_hybrid_screening(as_of_date: Optional[datetime] = None):
     df.to_csv(output_file, index=False)
     print(f"✅ Saved {len(df)} stocks to {output_file}")
     
+    # Parquet for fast Streamlit cold starts (dictionary-encoded sector)
+    parquet_file = 'data/latest_screening_hybrid.parquet'
+    df.astype({'sector': 'category'}).to_parquet(parquet_file, engine='pyarrow', index=False)
+    print(f"✅ Saved data to {parquet_file}")
+    
     # JSON for API access
     json_file = 'data/latest_screening_hybrid.json'
     df.to_json(json_file, orient='records', date_format='iso')
@@ -262,8 +262,10 @@ class HierarchicalRiskParity:
             'Minimum Variance': min_var_weights
         }
         
-        # Calculate portfolio metrics for each scheme
+        # Calculate portfolio metrics for each scheme (one dense returns array,
+        # each scheme's daily returns are a single matrix-vector product)
         comparison_results = {}
+        returns_array = top_returns.to_numpy()
         
         for scheme_name, weights in weighting_schemes.items():
             # Align weights with returns data
@@ -271,16 +273,16 @@ class HierarchicalRiskParity:
             aligned_weights = aligned_weights / aligned_weights.sum()
             
             # Calculate portfolio returns
-            portfolio_returns = (top_returns * aligned_weights).sum(axis=1)
+            portfolio_returns = returns_array @ aligned_weights.to_numpy()
             
             # Calculate metrics
             annual_return = portfolio_returns.mean() * 252
-            annual_vol = portfolio_returns.std() * np.sqrt(252)
+            annual_vol = portfolio_returns.std(ddof=1) * np.sqrt(252)
             sharpe_ratio = annual_return / annual_vol if annual_vol > 0 else 0
             
-            # Calculate maximum drawdown
-            cumulative = (1 + portfolio_returns).cumprod()
-            running_max = cumulative.expanding().max()
+            # Calculate maximum drawdown (running peak as one ufunc scan)
+            cumulative = np.cumprod(1 + portfolio_returns)
+            running_max = np.maximum.accumulate(cumulative)
             drawdown = (cumulative - running_max) / running_max
             max_drawdown = drawdown.min()
             
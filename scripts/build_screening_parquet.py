@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""Convert the screening CSV export into the Parquet file read by the Streamlit app."""
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--csv-path",
+        type=Path,
+        default=ROOT / "data" / "latest_screening_hybrid.csv",
+        help="Screening CSV to convert.",
+    )
+    parser.add_argument(
+        "--output-path",
+        type=Path,
+        default=None,
+        help="Destination Parquet file (defaults to the CSV path with a .parquet suffix).",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    output_path = args.output_path or args.csv_path.with_suffix(".parquet")
+
+    df = pd.read_csv(args.csv_path)
+    # Categorical sector is stored dictionary-encoded and reads back as category
+    df.astype({"sector": "category"}).to_parquet(output_path, engine="pyarrow", index=False)
+
+    print(f"✅ Wrote {len(df)} rows to {output_path}")
+
+
+if __name__ == "__main__":
+    main()
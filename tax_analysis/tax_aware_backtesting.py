@@ -232,9 +232,9 @@ class TaxAwareBacktestEngine(BacktestEngine):
                                      after_tax_returns: pd.Series) -> Dict[str, float]:
         """Calculate comprehensive tax-adjusted performance metrics"""
         
-        # Basic return metrics
-        pre_tax_total = (1 + pre_tax_returns).prod() - 1
-        after_tax_total = (1 + after_tax_returns).prod() - 1
+        # Basic return metrics (compounded as a log-sum, skipping missing days)
+        pre_tax_total = np.expm1(np.nansum(np.log1p(pre_tax_returns.to_numpy(dtype=np.float64))))
+        after_tax_total = np.expm1(np.nansum(np.log1p(after_tax_returns.to_numpy(dtype=np.float64))))
         
         # Annualized returns
         years = len(pre_tax_returns) / 252
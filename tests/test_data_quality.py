@@ -0,0 +1,98 @@
+"""Tests for screening dataset validation."""
+import pandas as pd
+import pytest
+
+from data_quality.monitoring import clear_validation_cache, validate_screening_dataframe
+
+
+@pytest.fixture
+def screening_df():
+    """Three valid screening rows."""
+    clear_validation_cache()
+    return pd.DataFrame({
+        'magic_formula_rank': [1, 2, 3],
+        'ticker': ['AAA', 'BBB', 'CCC'],
+        'company_name': ['Alpha Inc', 'Beta Corp', 'Gamma Ltd'],
+        'sector': ['Energy', 'Utilities', 'Financials'],
+        'earnings_yield': [0.15, 0.12, 0.10],
+        'roc': [0.40, 0.35, 0.30],
+        'f_score': [8, 7, 6],
+        'market_cap': [5e9, 3e9, 2e9],
+        'enterprise_value': [6e9, 4e9, 2.5e9],
+        'ebit': [9e8, 4.8e8, 2.5e8],
+        'last_updated': ['2024-01-02'] * 3,
+    })
+
+
+class TestValidateScreeningDataframe:
+    """Tests for validate_screening_dataframe rule violations."""
+
+    def test_valid_frame_is_returned(self, screening_df):
+        """A frame passing every check comes back unchanged."""
+        assert validate_screening_dataframe(screening_df) is screening_df
+
+    def test_empty_frame(self):
+        """An empty frame is rejected."""
+        with pytest.raises(ValueError, match="empty"):
+            validate_screening_dataframe(pd.DataFrame())
+
+    def test_missing_columns(self, screening_df):
+        """Missing required columns are all named."""
+        with pytest.raises(ValueError, match="missing required columns: roc, ebit"):
+            validate_screening_dataframe(screening_df.drop(columns=['roc', 'ebit']))
+
+    def test_null_string(self, screening_df):
+        """Null identifiers are rejected."""
+        screening_df.loc[1, 'ticker'] = None
+        with pytest.raises(ValueError, match="'ticker' contains null values"):
+            validate_screening_dataframe(screening_df)
+
+    def test_blank_string(self, screening_df):
+        """Whitespace-only identifiers are rejected."""
+        screening_df.loc[2, 'sector'] = "   "
+        with pytest.raises(ValueError, match="'sector' contains blank values"):
+            validate_screening_dataframe(screening_df)
+
+    def test_non_numeric(self, screening_df):
+        """Values that do not parse as numbers are rejected."""
+        screening_df['roc'] = screening_df['roc'].astype(object)
+        screening_df.loc[0, 'roc'] = "n/a"
+        with pytest.raises(ValueError, match="'roc' contains missing or non-numeric values"):
+            validate_screening_dataframe(screening_df)
+
+    def test_out_of_range(self, screening_df):
+        """Range checks report which bound was crossed."""
+        screening_df.loc[0, 'earnings_yield'] = -1.5
+        with pytest.raises(ValueError, match="'earnings_yield' has values below the minimum of -1.0"):
+            validate_screening_dataframe(screening_df)
+
+        screening_df.loc[0, 'earnings_yield'] = 0.15
+        screening_df.loc[0, 'f_score'] = 10
+        with pytest.raises(ValueError, match="'f_score' has values above the maximum of 9"):
+            validate_screening_dataframe(screening_df)
+
+    def test_non_positive(self, screening_df):
+        """Market cap must be positive."""
+        screening_df.loc[1, 'market_cap'] = 0
+        with pytest.raises(ValueError, match="'market_cap' must contain positive values"):
+            validate_screening_dataframe(screening_df)
+
+    def test_fractional_rank(self, screening_df):
+        """Ranks must be whole numbers."""
+        screening_df['magic_formula_rank'] = [1.0, 2.5, 3.0]
+        with pytest.raises(ValueError, match="'magic_formula_rank' must contain whole numbers"):
+            validate_screening_dataframe(screening_df)
+
+    def test_first_failure_wins(self, screening_df):
+        """With several violations, string checks come before numeric ones."""
+        screening_df.loc[0, 'market_cap'] = -1
+        screening_df.loc[0, 'company_name'] = ""
+        with pytest.raises(ValueError, match="'company_name' contains blank values"):
+            validate_screening_dataframe(screening_df)
+
+    def test_changed_frame_is_revalidated(self, screening_df):
+        """A validated frame edited afterwards is checked again."""
+        validate_screening_dataframe(screening_df)
+        screening_df.loc[0, 'roc'] = 20.0
+        with pytest.raises(ValueError, match="'roc' has values above the maximum"):
+            validate_screening_dataframe(screening_df)
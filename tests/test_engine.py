@@ -0,0 +1,65 @@
+"""Tests for the backtesting engine."""
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtesting.engine import BacktestConfig, BacktestEngine
+
+
+@pytest.fixture
+def engine():
+    """Engine over a small price matrix, set up as fetch_historical_prices leaves it.
+
+    CCC has no closes before 2024-01-03 and a gap on 2024-01-04.
+    """
+    price_matrix = pd.DataFrame(
+        {
+            'AAA': [100.0, 110.0, 121.0, 121.0, 108.9],
+            'BBB': [50.0, 50.0, 45.0, 54.0, 54.0],
+            'CCC': [np.nan, np.nan, 20.0, np.nan, 22.0],
+        },
+        index=pd.bdate_range("2024-01-01", periods=5),
+        dtype=np.float32,
+    )
+    eng = BacktestEngine(BacktestConfig())
+    eng.price_matrix = price_matrix
+    eng.returns_array = np.ascontiguousarray(
+        price_matrix.ffill().pct_change(fill_method=None).to_numpy()
+    )
+    eng.dates = price_matrix.index
+    eng.ticker_to_col = {ticker: col for col, ticker in enumerate(price_matrix.columns)}
+    return eng
+
+
+class TestCalculatePortfolioReturns:
+    """Tests for equal-weighted period returns."""
+
+    def test_equal_weighted_returns(self, engine):
+        """Daily returns after the start date are averaged across holdings."""
+        portfolio = pd.DataFrame({'ticker': ['AAA', 'BBB']})
+        returns = engine.calculate_portfolio_returns(
+            portfolio, datetime(2024, 1, 1), datetime(2024, 1, 5)
+        )
+        assert returns.index.tolist() == list(pd.bdate_range("2024-01-02", periods=4))
+        np.testing.assert_allclose(
+            returns.to_numpy(), [0.05, 0.0, 0.1, -0.05], atol=1e-6
+        )
+
+    def test_stocks_without_prices_are_skipped(self, engine):
+        """Holdings are only averaged from their first close; gaps count as flat."""
+        portfolio = pd.DataFrame({'ticker': ['AAA', 'CCC', 'ZZZ']})
+        returns = engine.calculate_portfolio_returns(
+            portfolio, datetime(2024, 1, 2), datetime(2024, 1, 5)
+        )
+        np.testing.assert_allclose(
+            returns.to_numpy(), [0.10, 0.0, (-0.10 + 0.10) / 2], atol=1e-6
+        )
+
+    def test_empty_portfolio(self, engine):
+        """No holdings gives an empty series."""
+        returns = engine.calculate_portfolio_returns(
+            pd.DataFrame({'ticker': []}), datetime(2024, 1, 1), datetime(2024, 1, 5)
+        )
+        assert returns.empty
@@ -0,0 +1,52 @@
+"""Tests for backtest performance metrics."""
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtesting.metrics import calculate_drawdown_metrics
+
+
+@pytest.fixture
+def returns():
+    """Up 10%, down to a 20% drawdown, then a full recovery."""
+    dates = pd.bdate_range("2024-01-01", periods=5)
+    return pd.Series([0.10, -0.10, -0.1111111111, 0.125, 0.15], index=dates)
+
+
+class TestDrawdownMetrics:
+    """Tests for calculate_drawdown_metrics."""
+
+    def test_max_drawdown_and_recovery(self, returns):
+        """Peak 1.10 falls to 0.88, then is regained four days later."""
+        metrics = calculate_drawdown_metrics(returns)
+        assert metrics['max_drawdown'] == pytest.approx(-0.20)
+        assert metrics['max_drawdown_date'] == returns.index[2]
+        assert metrics['recovery_time_days'] == 2
+        assert metrics['avg_drawdown'] == pytest.approx((-0.10 - 0.20 - 0.10) / 3)
+
+    def test_no_recovery(self, returns):
+        """A drawdown never regained has no recovery time."""
+        metrics = calculate_drawdown_metrics(returns.iloc[:3])
+        assert metrics['recovery_time_days'] is None
+
+    def test_missing_returns_are_skipped(self, returns):
+        """A gap leaves the compounding intact and its own drawdown NaN."""
+        gapped = returns.copy()
+        gapped.iloc[1] = np.nan
+        metrics = calculate_drawdown_metrics(gapped)
+
+        expected = (1 + gapped).cumprod()
+        expected = (expected - expected.expanding().max()) / expected.expanding().max()
+        assert metrics['max_drawdown'] == pytest.approx(expected.min())
+        assert metrics['max_drawdown_date'] == expected.idxmin()
+        assert math.isnan(metrics['drawdown_series'].iloc[1])
+        pd.testing.assert_series_equal(metrics['drawdown_series'], expected, check_freq=False)
+
+    def test_all_missing(self):
+        """A series with no returns has no drawdown."""
+        gapped = pd.Series([np.nan, np.nan], index=pd.bdate_range("2024-01-01", periods=2))
+        metrics = calculate_drawdown_metrics(gapped)
+        assert math.isnan(metrics['max_drawdown'])
+        assert metrics['max_drawdown_date'] is None
@@ -0,0 +1,90 @@
+"""Tests for risk-constrained portfolio construction."""
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtesting.risk_constraints import RiskConstraintManager
+
+
+@pytest.fixture
+def manager():
+    """Manager with betas fixed at 1.0 instead of downloaded."""
+    rm = RiskConstraintManager(beta_cache_dir=None)
+    with patch.object(
+        RiskConstraintManager, 'compute_betas_batch',
+        side_effect=lambda tickers, days=252: np.ones(len(tickers)),
+    ):
+        yield rm
+
+
+@pytest.fixture
+def ranked_universe():
+    """40 ranked stocks: a mixed top 15, 5 more utilities, then financials.
+
+    The top 15 alternate mid and large caps across Utilities, Information
+    Technology and Health Care; everything after them is large cap.
+    """
+    sectors = (
+        ['Utilities', 'Information Technology', 'Health Care'] * 5
+        + ['Utilities'] * 5
+        + ['Financials'] * 20
+    )
+    market_caps = [20e9 if i % 2 == 0 else 100e9 for i in range(15)] + [100e9] * 25
+    return pd.DataFrame({
+        'ticker': [f"T{i:02d}" for i in range(40)],
+        'sector': sectors,
+        'market_cap': market_caps,
+        'magic_formula_rank': range(1, 41),
+    })
+
+
+class TestApplyRiskConstraints:
+    """Tests for the greedy constrained selection."""
+
+    def test_picks_on_fixed_universe(self, manager, ranked_universe):
+        """Utilities past the first 15 exceed 10%; financials stop at 25%."""
+        portfolio = manager.apply_risk_constraints(ranked_universe, target_size=20)
+        expected = [f"T{i:02d}" for i in list(range(15)) + list(range(20, 25))]
+        assert portfolio['ticker'].tolist() == expected
+
+    def test_instance_limit_override(self, manager, ranked_universe):
+        """Raising the utilities limit on one manager lets them in."""
+        manager.sector_limits['Utilities'] = 0.5
+        portfolio = manager.apply_risk_constraints(ranked_universe, target_size=20)
+        assert portfolio['ticker'].tolist() == [f"T{i:02d}" for i in range(20)]
+        assert RiskConstraintManager.SECTOR_LIMITS['Utilities'] == 0.10
+
+    def test_portfolio_is_enriched(self, manager, ranked_universe):
+        """Selected rows carry beta and market cap segment."""
+        portfolio = manager.apply_risk_constraints(ranked_universe, target_size=20)
+        assert (portfolio['beta'] == 1.0).all()
+        assert portfolio['market_cap_segment'].iloc[0] == 'mid_cap'
+        assert portfolio['market_cap_segment'].iloc[1] == 'large_cap'
+
+
+class TestValidatePortfolioConstraints:
+    """Tests for the constraint validation summary."""
+
+    def test_violations_in_weight_order(self, manager):
+        """Sector violations are listed from the heaviest sector down."""
+        portfolio = pd.DataFrame({
+            'sector': ['Utilities'] * 6 + ['Energy'] * 4,
+            'market_cap_segment': ['large_cap'] * 5 + ['mid_cap'] * 4 + ['small_cap'],
+            'beta': [1.0] * 10,
+        })
+        results = manager.validate_portfolio_constraints(portfolio)
+
+        assert results['sector_weights'] == {'Utilities': 0.6, 'Energy': 0.4}
+        assert not results['sector_valid']
+        assert results['violations'][0].startswith('Utilities: 60.0%')
+        assert results['violations'][1].startswith('Energy: 40.0%')
+        assert results['size_valid']
+        assert results['portfolio_beta'] == 1.0
+        assert not results['concentration_valid']
+
+    def test_empty_portfolio(self, manager):
+        """An empty portfolio reports a single violation."""
+        results = manager.validate_portfolio_constraints(pd.DataFrame())
+        assert results['violations'] == ['Empty portfolio']
@@ -0,0 +1,59 @@
+"""Tests for the extended backtest report."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtesting.engine import BacktestConfig
+from backtesting.metrics import create_performance_summary
+from backtesting.run_extended_backtest import print_extended_results
+
+
+@pytest.fixture
+def backtest_results():
+    """run_backtest()-shaped results covering the Recovery (2003-2006) period."""
+    dates = pd.bdate_range("2003-01-01", "2006-12-31")
+    rng = np.random.default_rng(7)
+    portfolio_returns = pd.Series(rng.normal(0.0005, 0.01, len(dates)), index=dates)
+    portfolio_returns.iloc[10] = np.nan
+    benchmark_returns = pd.Series(rng.normal(0.0003, 0.01, len(dates)), index=dates)
+    return {
+        'portfolio_returns': portfolio_returns,
+        'benchmark_returns': benchmark_returns,
+        'transaction_costs': 0.0123,
+        'portfolio_history': [],
+        'config': BacktestConfig(start_date="2003-01-01", end_date="2006-12-31"),
+    }
+
+
+class TestPrintExtendedResults:
+    """Tests for the market cycle and cost sections of the report."""
+
+    def test_market_cycle_returns(self, backtest_results, capsys):
+        """Period returns compound like pandas' skipna prod."""
+        summary = create_performance_summary(backtest_results)
+        print_extended_results(summary, backtest_results['config'], backtest_results)
+        output = capsys.readouterr().out
+
+        portfolio_return = (1 + backtest_results['portfolio_returns']).prod() - 1
+        benchmark_return = (1 + backtest_results['benchmark_returns']).prod() - 1
+        assert "Recovery (2003-2006):" in output
+        assert f"Portfolio: {portfolio_return*100:+.1f}%" in output
+        assert f"Benchmark: {benchmark_return*100:+.1f}%" in output
+        assert "Rolling quarterly:" in output
+
+    def test_periods_without_data_are_skipped(self, backtest_results, capsys):
+        """Only periods overlapping the return series are printed."""
+        summary = create_performance_summary(backtest_results)
+        print_extended_results(summary, backtest_results['config'], backtest_results)
+        output = capsys.readouterr().out
+
+        assert "Dot-com Crash" not in output
+        assert "Financial Crisis" not in output
+
+    def test_transaction_costs_from_results(self, backtest_results, capsys):
+        """Costs come from the raw results, not the summary."""
+        summary = create_performance_summary(backtest_results)
+        print_extended_results(summary, backtest_results['config'], backtest_results)
+        output = capsys.readouterr().out
+
+        assert "Total transaction costs: 1.23%" in output